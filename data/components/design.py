@@ -0,0 +1,33 @@
+import numpy as np
+from scipy.linalg import solve_continuous_are
+
+
+def ackermann(A, B, poles):
+    """Returns the state feedback gains K, which place the poles of the
+    closed loop system A - B*K at poles (Ackermann's formula). Complex
+    poles must come with their conjugates."""
+
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float).reshape(-1, 1)
+    n = len(A)
+
+    ctrb = np.hstack([np.linalg.matrix_power(A, i) @ B for i in range(n)])
+    coeffs = np.real_if_close(np.poly(poles)).real
+    phi = sum(coeff*np.linalg.matrix_power(A, n - i)
+              for i, coeff in enumerate(coeffs))
+
+    last = np.zeros(n)
+    last[-1] = 1
+    return np.linalg.solve(ctrb.T, last) @ phi
+
+
+def lqr(A, B, Q, R):
+    """Returns the gains K of the linear quadratic regulator, which
+    minimizes the integral of x'Qx + u'Ru for u = -K x."""
+
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float).reshape(len(A), -1)
+    R = np.atleast_2d(np.asarray(R, dtype=float))
+
+    P = solve_continuous_are(A, B, Q, R)
+    return np.linalg.solve(R, B.T @ P).reshape(-1)
@@ -1,8 +1,13 @@
+import pygame as pg
+
+
 class Plane:
 
     def __init__(self, width, height):
         self._width = width
         self._height = height
+        self._layer = None
+        self._layer_key = None
         self._zero_pos_Re = height//2
         self._zero_pos_Im = width//2 + 150
 
@@ -12,6 +17,20 @@ class Plane:
         self.Im_axis = Axis(self._zero_pos_Im, length=self._height,
                             wide=self._width, direc='y')
 
+    def get_layer(self, render):
+        """Returns the layer with grid and axes. It is drawn by render only
+        when the scale levels of the axes have changed."""
+
+        key = self.Re_axis.scale_lvl, self.Im_axis.scale_lvl
+        if key != self._layer_key:
+            if self._layer is None:
+                self._layer = pg.Surface((self._width, self._height))
+                if pg.display.get_surface() is not None:
+                    self._layer = self._layer.convert()
+            render(self._layer)
+            self._layer_key = key
+        return self._layer
+
     def get_point(self, pos):
         x = (pos[0]-self._zero_pos_Im) / self.Re_axis.get_scale()
         y = (self._zero_pos_Re-pos[1]) / self.Im_axis.get_scale()
@@ -85,6 +104,7 @@ class Axis:
                 self._scale_lvl = 0
             else:
                 self._scale_lvl -= 1
+        self._scale = self._scales[self._scale_lvl]
 
     def get_line(self):
         return self._start, self._end
@@ -92,6 +112,10 @@ class Axis:
     def get_scale(self):
         return self._scale
 
+    @property
+    def scale_lvl(self):
+        return self._scale_lvl
+
     @staticmethod
     def get_positions():
         return Axis.positions
@@ -137,6 +161,14 @@ class Pole:
     def r(self):
         return self._r
 
+    @property
+    def Re(self):
+        return self._Re
+
+    @property
+    def Im(self):
+        return self._Im
+
     def __str__(self):
         if self._Im > 0:
             return f'{round(self._Re, 3)} +{round(self._Im, 3)}i'
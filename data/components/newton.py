@@ -1,6 +1,6 @@
 import math as m
 
-from .. import pg_init
+from .. import constants
 
 GRAVITY = 9.81
 
@@ -56,7 +56,7 @@ class _State:
 
         self.t = 0
         self.fps = 100
-        self.scale = pg_init.SCALE
+        self.scale = constants.SCALE
 
         self.real_r = self.ball_r / self.scale
 
@@ -1,9 +1,8 @@
 import math as m
 
-from .. import pg_init
-from .. interface.label import Label
+from .. import constants
 
-SCALE = pg_init.SCALE
+SCALE = constants.SCALE
 
 
 class Cone:
@@ -168,7 +167,7 @@ class Ruler:
         self.len = length
         self.scales = []
         self.num_labels = []
-        self.marker = RulerMarker(pg_init.SCREEN_SIZE[0]//2,
+        self.marker = RulerMarker(constants.SCREEN_SIZE[0]//2,
                                   self.pos+10, marker_color)
 
     def set_scales(self, main_scale_len, scale_len, scale_w, subs=5):
@@ -199,6 +198,9 @@ class Ruler:
                 self.scales.append((start, end))
 
     def set_labels(self, top, size, margin=0):
+        # Labels render with pygame fonts, other objects stay headless
+        from .. interface.label import Label
+
         for num, pos_x in self.get_numbers():
             self.num_labels.append(Label(pos_x+margin, self.pos+top,
                                          size, text=str(num)))
@@ -312,7 +314,7 @@ class Wall:
         self._t = thickness
         self._ori = orientation
 
-        WIDTH, HEIGHT = pg_init.SCREEN_SIZE
+        WIDTH, HEIGHT = constants.SCREEN_SIZE
         if self._ori == 'left':
             x = int(round(self._pos*SCALE))
             self._rect = (x-self._t, 0, self._t, self._h+1)
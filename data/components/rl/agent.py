@@ -2,9 +2,6 @@ import os
 
 import numpy as np
 
-print(" -- Loading TensorFlow -- ")
-from tensorflow import keras
-
 
 # Just disables the warning, doesn't enable AVX/FMA
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
@@ -20,11 +17,24 @@ class Agent:
         self._type = None
         self._input_size = None
 
-    def load_model(self, model_name):
-        path = 'data\\components\\rl\\models\\' + model_name
-        self.model = keras.models.load_model(path, compile=False)
-        self._input_size = self.model.input.shape[1]
-        outputsize = self.model.output.shape[1]
+    def load_model(self, model_name, backend='numpy'):
+        """Loads a trained model. The default NumPy backend only extracts
+        weights and activations for its own forward pass, backend 'keras'
+        loads the complete TensorFlow Keras model. Backends are imported
+        not before a model is loaded."""
+
+        path = os.path.join('data', 'components', 'rl', 'models', model_name)
+        if backend == 'keras':
+            print(" -- Loading TensorFlow -- ")
+            from tensorflow import keras
+            self.model = keras.models.load_model(path, compile=False)
+            self._input_size = self.model.input.shape[1]
+            outputsize = self.model.output.shape[1]
+        else:
+            from . import inference
+            self.model = inference.NumpyModel(path)
+            self._input_size = self.model.input_size
+            outputsize = self.model.output_size
         if outputsize == 1:
             self._type = 'REINFORCE'
         elif outputsize == 2:
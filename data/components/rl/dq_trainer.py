@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from . replay import PrioritizedReplayMemory
+
+
+# Just disables the warning, doesn't enable AVX/FMA
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+
+class DQNTrainer:
+    """Deep-Q learning loop with a frozen target network.
+
+    Target Q-values come from a copy of the model, which is either copied
+    every target_update gradient steps or, when tau is given, follows the
+    model by Polyak averaging after every gradient step. Once train_begin
+    episodes are played, train_steps gradient steps run after every
+    environment step. Forward pass and gradient step are compiled with
+    tf.function. A PrioritizedReplayMemory is sampled with
+    importance-sampling weights and gets the TD errors back as priorities.
+    """
+
+    def __init__(self, model, env, replay_memory, optimizer, loss_fn,
+                 n_outputs=2, batch_size=128, discount_factor=0.99,
+                 n_max_steps=200, train_begin=200, train_steps=1,
+                 target_update=1000, tau=None, beta_start=0.4, gym=False):
+        self.model = model
+        self.env = env
+        self.replay_memory = replay_memory
+        self.optimizer = optimizer
+        self.loss_fn = loss_fn
+
+        self.n_outputs = n_outputs
+        self.batch_size = batch_size
+        self.discount_factor = discount_factor
+        self.n_max_steps = n_max_steps
+        self.train_begin = train_begin
+        self.train_steps = train_steps
+        self.target_update = target_update
+        self.tau = tau
+        self.beta_start = beta_start
+        self.gym = gym
+
+        self.target = keras.models.clone_model(model)
+        self.target.set_weights(model.get_weights())
+
+        self.epsilon = 1.0
+        self.gradient_steps = 0
+        self.best_score = 0
+        self.best_weights = None
+        self.reward_progress = []
+
+        state_spec = tf.TensorSpec([None, replay_memory.states.shape[1]],
+                                   tf.float32)
+        self._q_values = tf.function(self._forward,
+                                     input_signature=[state_spec])
+        self._train_step = tf.function(self._gradient_step)
+
+    def train(self, max_eps, epsilon_decay=0.9997, epsilon_min=0.01):
+        """Plays max_eps episodes and trains the model. Returns the total
+        reward of every episode."""
+
+        prioritized = isinstance(self.replay_memory, PrioritizedReplayMemory)
+        for episode in range(max_eps):
+            obs = self.env.reset()
+            if prioritized:
+                self.replay_memory.beta = min(
+                    1.0, self.beta_start
+                    + (1 - self.beta_start)*episode/max_eps
+                )
+
+            episode_rewards = []
+            for step in range(self.n_max_steps):
+                if episode >= self.train_begin:
+                    self.epsilon = max(self.epsilon*epsilon_decay,
+                                       epsilon_min)
+                obs, reward, done = self.play_one_step(obs)
+                episode_rewards.append(reward)
+
+                if episode > self.train_begin:
+                    for _ in range(self.train_steps):
+                        self.training_step()
+                if done:
+                    break
+
+            episode_total_reward = round(float(np.sum(episode_rewards)), 2)
+            self.reward_progress.append(episode_total_reward)
+            if episode_total_reward > self.best_score:
+                self.best_weights = self.model.get_weights()
+                self.best_score = episode_total_reward
+            print(f'done episode {episode+1} of {max_eps} e={self.epsilon}'
+                  + f'- r[{episode_total_reward}]({self.best_score})')
+
+        return self.reward_progress
+
+    def epsilon_greedy_policy(self, state):
+        if np.random.rand() < self.epsilon:
+            return np.random.randint(self.n_outputs)
+        state = np.asarray(state, dtype=np.float32).reshape(1, -1)
+        return int(np.argmax(self._q_values(state)[0]))
+
+    def play_one_step(self, state):
+        action = self.epsilon_greedy_policy(state)
+        if self.gym:
+            next_state, reward, done, _ = self.env.step(action)
+        else:
+            next_state, reward, done = self.env.step(action)
+        self.replay_memory.append(state, action, reward, next_state, done)
+        return next_state, reward, done
+
+    def training_step(self):
+        if isinstance(self.replay_memory, PrioritizedReplayMemory):
+            experiences, indices, weights = \
+                self.replay_memory.sample_weighted(self.batch_size)
+        else:
+            experiences = self.replay_memory.sample(self.batch_size)
+            weights = np.ones(self.batch_size, dtype=np.float32)
+
+        states, actions, rewards, next_states, dones = experiences
+        td_errors = self._train_step(states, actions, rewards, next_states,
+                                     dones.astype(np.float32), weights)
+        if isinstance(self.replay_memory, PrioritizedReplayMemory):
+            self.replay_memory.update_priorities(indices, td_errors.numpy())
+
+        self.gradient_steps += 1
+        self.update_target()
+
+    def update_target(self):
+        """Hard copy every target_update gradient steps, or a Polyak
+        average after every step when tau is set."""
+
+        if self.tau is not None:
+            for target_var, var in zip(self.target.weights,
+                                       self.model.weights):
+                target_var.assign(self.tau*var + (1 - self.tau)*target_var)
+        elif self.gradient_steps % self.target_update == 0:
+            self.target.set_weights(self.model.get_weights())
+
+    def _forward(self, states):
+        return self.model(states, training=False)
+
+    def _gradient_step(self, states, actions, rewards, next_states, dones,
+                       weights):
+        next_Q_values = self.target(next_states, training=False)
+        max_next_Q_values = tf.reduce_max(next_Q_values, axis=1)
+        target_Q_values = (rewards
+                           + (1 - dones)*self.discount_factor
+                           * max_next_Q_values)
+        mask = tf.one_hot(actions, self.n_outputs)
+        with tf.GradientTape() as tape:
+            all_Q_values = self.model(states, training=True)
+            Q_values = tf.reduce_sum(all_Q_values*mask, axis=1)
+            loss = tf.reduce_mean(weights*self.loss_fn(
+                target_Q_values[:, tf.newaxis], Q_values[:, tf.newaxis]
+            ))
+        grads = tape.gradient(loss, self.model.trainable_variables)
+        self.optimizer.apply_gradients(
+            zip(grads, self.model.trainable_variables)
+        )
+        return target_Q_values - Q_values
@@ -11,8 +11,10 @@ class Environment:
     step_ = 0
 
     def __init__(self, euler_stepsize=0.001, ref=False, adv_reward=False,
-                 variance=0):
+                 variance=0, exact=False, n_max_steps=200):
         self._euler_stepsize = euler_stepsize
+        self._spf = 50  # 30
+        self._exact = exact
 
         self._adv_reward = adv_reward
         self._ref = ref
@@ -21,7 +23,35 @@ class Environment:
         self._model = setup_sim.StateSpaceModel()
         self._agent = agent.Agent(sensibility=10000)
 
-    def reset(self):
+        fakefps = 1 / (self._euler_stepsize*self._spf)
+        self._integrator = euler.Integrator()
+        self._integrator.setup(self._model.A, self._model.B, fakefps,
+                               self._spf)
+
+        # Exact mode: one zero-order-hold update of the uncontrolled system
+        # per step instead of spf Euler mini steps. The observation is
+        # sampled one mini step before the end of the period like in the
+        # Euler path.
+        self._model.set_Kregs(0, 0, 0, 0)
+        self._period = self._euler_stepsize*self._spf
+        self._Ad, self._Bd = self._model.discretize(self._period)
+        self._Ad_obs, self._Bd_obs = self._model.discretize(
+            self._period - self._euler_stepsize
+        )
+
+        # Trajectory buffer sized to one episode and reused by every
+        # episode. An extra column holds the reference state, so that
+        # observations are copied from single rows of the buffer.
+        self._rows = 2 if self._exact else self._spf
+        self._obs_lag = 1
+        self._sim = setup_sim.SimData(n_max_steps*self._rows + 1,
+                                      width=5 if self._ref else 4)
+        self._x = self._sim.states[:, :4]
+
+    def reset(self, out=None):
+        """Samples a new initial state. Returns the observation as a new
+        array or written into out."""
+
         Environment.step_ = 0
 
         if self._ref:
@@ -62,21 +92,32 @@ class Environment:
             )
 
         init_state_tuple = tuple(rand_init_state.tolist())
-        self._sim = setup_sim.SimData(120_000, init_state_tuple)
-        return rand_init_state
+        self._sim.reset(init_state_tuple)
+        return self._get_obs(0, out)
+
+    def step(self, action, out=None):
+        """Returns observation, reward and done flag. The observation is a
+        new array or written into out, it is never a view on the trajectory
+        buffer, whose rows are overwritten when it wraps around or is reused
+        by the next episode."""
 
-    def step(self, action):
         self._agent._trainact(action)
 
         done = False
         reward = 0.0
 
-        spf = 50  # 30
-        fakefps = 1 / (self._euler_stepsize*spf)
-        _obs_ = euler.euler_method(self._model.A, self._model.B,
-                                   self._sim.state_vec, self._sim.t_vec,
-                                   fakefps, spf, Environment.step_,
-                                   control_object=self._agent)
+        if Environment.step_ + self._rows > self._sim.sim_length - 1:
+            # Episode is longer than the buffer, continue at its beginning
+            self._sim.states[0] = self._sim.states[Environment.step_]
+            self._sim.t_vec[0] = self._sim.t_vec[Environment.step_]
+            Environment.step_ = 0
+
+        if self._exact:
+            _obs_ = self._exact_step()
+        else:
+            _obs_ = self._integrator.frame(self._x, self._sim.t_vec,
+                                           Environment.step_,
+                                           control_object=self._agent)
         x1, x2, x3, x4, _ = _obs_
 
         if abs(x3) > m.radians(20) or abs(x1) > 1.5:
@@ -91,17 +132,35 @@ class Environment:
             if done:
                 reward = 0.0
 
-        Environment.step_ += spf
+        Environment.step_ += self._rows
 
+        obs = self._get_obs(Environment.step_ - self._obs_lag, out)
+        return obs, reward, done
+
+    def _get_obs(self, row, out=None):
+        states = self._sim.states
         if self._ref:
-            obs = np.array([np.float(x1), np.float(x2),
-                            np.float(x3), np.float(x4),
-                            np.float(self._ref_state)])
-        else:
-            obs = np.array([np.float(x1), np.float(x2),
-                            np.float(x3), np.float(x4)])
+            states[row, 4:] = self._ref_state
+        if out is None:
+            return states[row].copy()
+        out[:] = states[row]
+        return out
 
-        return obs, reward, done
+    def _exact_step(self):
+        """Writes the state one mini step before the end of the period and
+        at its end, returns the first like Integrator.frame returns row
+        k+spf-1."""
+
+        k = Environment.step_
+        states = self._x
+        force = self._agent.force
+        states[k+1] = self._Ad_obs @ states[k] + self._Bd_obs*force
+        states[k+2] = self._Ad @ states[k] + self._Bd*force
+        self._sim.t_vec[k+1] = (self._sim.t_vec[k] + self._period
+                                - self._euler_stepsize)
+        self._sim.t_vec[k+2] = self._sim.t_vec[k] + self._period
+        x = states[k+1]
+        return x[0:1], x[1:2], x[2:3], x[3:4], False
 
     def rewarder(self, location, angle, ratio=0.5):
         reward = ratio*self._loc_rewardf(location, m=2, ref=self._ref_state) \
@@ -113,8 +172,152 @@ class Environment:
         if b is None:
             r_max = Environment._ang_rewardf(0, sigma, b=0, multi=multi)
             b = 1 - r_max
-        return ((m.exp(-(ang/sigma)**2/2)) / (sigma*m.sqrt(2*m.pi)))*multi + b
+        return ((np.exp(-(ang/sigma)**2/2)) / (sigma*m.sqrt(2*m.pi)))*multi + b
 
     @staticmethod
     def _loc_rewardf(loc, m=1, ref=0.0):
-        return 1 - m*abs(loc-ref)
+        return 1 - m*np.abs(loc-ref)
+
+
+class VecEnvironment:
+    """Holds n independent demonstrators in one (n, 4) state array.
+
+    All demonstrators are advanced by one batched transition per step,
+    rewards and done flags are computed with NumPy for all of them. Finished
+    episodes are reset automatically, their last observation is kept in
+    terminal_obs.
+
+    With Kregs the demonstrators run with a state feedback controller,
+    which drives them to their reference position. Forces are applied on
+    top of the closed loop.
+    """
+
+    def __init__(self, n, euler_stepsize=0.001, ref=False, adv_reward=False,
+                 variance=0, exact=False, sensibility=10000, auto_reset=True,
+                 Kregs=None):
+        self._n = n
+        self._spf = 50
+        self._sens = sensibility
+        self._auto_reset = auto_reset
+        self._controlled = Kregs is not None
+
+        self._adv_reward = adv_reward
+        self._ref = ref
+        self._variance = variance
+
+        model = setup_sim.StateSpaceModel()
+        model.set_Kregs(*(Kregs if self._controlled else (0, 0, 0, 0)))
+        fakefps = 1 / (euler_stepsize*self._spf)
+        self._period = 1 / fakefps
+        if exact:
+            self._transition = model.discretize(self._period)
+            self._obs_transition = model.discretize(self._period
+                                                    - euler_stepsize)
+        else:
+            # Observation is the state one mini step before the end of
+            # the frame, like Environment.step returns it
+            integrator = euler.Integrator()
+            integrator.setup(model.closed_loop(), model.B, fakefps,
+                             self._spf)
+            self._transition = integrator.transition()
+            self._obs_transition = integrator.transition(self._spf - 1)
+
+        self._states = np.zeros((n, 4))
+        self._ref_state = np.zeros(n)
+        self.episode_steps = np.zeros(n, dtype=int)
+        self.terminal_obs = None
+
+    def reset(self, mask=None):
+        """Resets all demonstrators or only those selected by a boolean
+        mask and returns the observations of all."""
+
+        if mask is None:
+            mask = np.ones(self._n, dtype=bool)
+        count = int(mask.sum())
+
+        ref_state = self._ref_state[mask]
+        if self._ref:
+            ref_state = np.random.randint(low=-2, high=3, size=count)/4
+
+        if self._variance == 0:
+            # low variance
+            high = np.array([0.02, 0.02, 0.02, 0.02])
+        elif self._variance == 1:
+            # med variance
+            high = np.array([0.2, 0.2, 0.2, 0.2])
+        elif self._variance == 2:
+            # high variance
+            high = np.array([1.0, 2.0, 0.2, 0.5])
+        init_states = np.random.uniform(low=-high, high=high, size=(count, 4))
+
+        if self._variance == 2:
+            ref_state = np.random.randint(low=-4, high=5, size=count)/8
+        else:
+            init_states[:, 0] += ref_state
+
+        self._states[mask] = init_states
+        self._ref_state[mask] = ref_state
+        self.episode_steps[mask] = 0
+        return self._get_obs(self._states)
+
+    def step(self, actions):
+        """Applies one action per demonstrator and returns the observations,
+        rewards and done flags as arrays."""
+
+        forces = np.where(np.asarray(actions) == 1, self._sens, -self._sens)
+        return self.step_forces(forces)
+
+    def step_forces(self, forces):
+        """Like step, with the force per demonstrator given directly."""
+
+        # The closed loop settles at the reference position
+        offset = 0
+        if self._controlled:
+            offset = np.zeros((self._n, 4))
+            offset[:, 0] = self._ref_state
+
+        Phi, Gam = self._obs_transition
+        obs_states = ((self._states - offset) @ Phi.T + offset
+                      + np.outer(forces, Gam))
+        Phi, Gam = self._transition
+        self._states = ((self._states - offset) @ Phi.T + offset
+                        + np.outer(forces, Gam))
+        self.episode_steps += 1
+
+        x1, x3 = obs_states[:, 0], obs_states[:, 2]
+        dones = (np.abs(x3) > m.radians(20)) | (np.abs(x1) > 1.5)
+
+        if self._adv_reward:
+            rewards = self.rewarder(x1, x3, ratio=0.75) - 100.0*dones
+        else:
+            rewards = np.where(dones, 0.0, 1.0)
+
+        obs = self._get_obs(obs_states)
+        self.terminal_obs = obs
+        if self._auto_reset and dones.any():
+            obs = obs.copy()
+            obs[dones] = self.reset(dones)[dones]
+
+        return obs, rewards, dones
+
+    def rewarder(self, location, angle, ratio=0.5):
+        loc_reward = Environment._loc_rewardf(location, m=2,
+                                              ref=self._ref_state)
+        return ratio*loc_reward + (1-ratio)*Environment._ang_rewardf(angle)
+
+    def _get_obs(self, states):
+        if self._ref:
+            return np.column_stack((states, self._ref_state))
+        return states.copy()
+
+    @property
+    def n(self):
+        return self._n
+
+    @property
+    def period(self):
+        return self._period
+
+    @property
+    def ref_state(self):
+        return self._ref_state
@@ -0,0 +1,144 @@
+import math as m
+import multiprocessing as mp
+
+import numpy as np
+
+from . import environment as env_
+from . inference import NumpyModel
+
+
+# Tolerance band of position error in m and tilt angle in rad for settling
+SETTLE_BAND = (0.005, m.radians(0.5))
+# Steps an episode must stay inside the band at its end to count as settled
+HOLD_STEPS = 50
+
+
+def _make_policy(policy):
+    """Returns the Kregs of a controller or a function, which maps a batch
+    of observations to actions, for a model path."""
+
+    if not isinstance(policy, str):
+        return tuple(float(k) for k in policy), None
+
+    model = NumpyModel(policy)
+    if model.output_size == 1:
+        # REINFORCE outputs the probability to go left
+        def act(obs):
+            left_proba = model.predict(obs)[:, 0]
+            return (np.random.rand(len(obs)) > left_proba).astype(int)
+    else:
+        # DQL outputs Q-values
+        def act(obs):
+            return np.argmax(model.predict(obs), axis=1)
+    act.input_size = model.input_size
+    return None, act
+
+
+def _run_episodes(policy, n_eps, n_max_steps, seed, settle_band=SETTLE_BAND,
+                  hold_steps=HOLD_STEPS, **env_kwargs):
+    """Plays n_eps episodes in lockstep and returns per episode whether it
+    survived, its total reward, settling time and overshoot."""
+
+    np.random.seed(seed)
+    Kregs, act = _make_policy(policy)
+    if act is not None:
+        env_kwargs['ref'] = act.input_size == 5
+
+    env = env_.VecEnvironment(n_eps, auto_reset=False, Kregs=Kregs,
+                              **env_kwargs)
+    obs = env.reset()
+    ref_x = env.ref_state.copy()
+    error_0 = obs[:, 0] - ref_x
+
+    alive = np.ones(n_eps, dtype=bool)
+    total_rewards = np.zeros(n_eps)
+    overshoot = np.zeros(n_eps)
+    last_outside = np.zeros(n_eps, dtype=int)
+    zero_forces = np.zeros(n_eps)
+    for step in range(1, n_max_steps + 1):
+        if act is None:
+            obs, rewards, dones = env.step_forces(zero_forces)
+        else:
+            obs, rewards, dones = env.step(act(obs))
+
+        total_rewards += np.where(alive, rewards, 0)
+        alive &= ~dones
+
+        # Overshoot is the largest excursion beyond the reference
+        error = obs[:, 0] - ref_x
+        overshoot = np.where(
+            alive, np.maximum(overshoot, -np.sign(error_0)*error), overshoot
+        )
+        outside = ((np.abs(error) > settle_band[0])
+                   | (np.abs(obs[:, 2]) > settle_band[1]))
+        last_outside[alive & outside] = step
+
+    # Settled episodes stayed inside the band for at least the last
+    # hold_steps steps
+    settled = alive & (last_outside <= n_max_steps - hold_steps)
+    settling_time = np.where(settled, last_outside*env.period, np.nan)
+    return alive, total_rewards, settling_time, overshoot
+
+
+def evaluate(policy, n_episodes=1000, n_max_steps=200, processes=1,
+             seed=None, **kwargs):
+    """Evaluates a policy over n_episodes random initial states. Policy is
+    either the Kregs of a state feedback controller or the path of a
+    trained model. Episodes are spread over processes workers, keyword
+    arguments go to _run_episodes, like settle_band and hold_steps, and the
+    VecEnvironment. Returns a dict of per episode arrays."""
+
+    processes = processes or mp.cpu_count()
+    chunks = [len(chunk) for chunk in
+              np.array_split(np.arange(n_episodes), processes)]
+    seeds = np.random.RandomState(seed).randint(2**31, size=len(chunks))
+    tasks = [(policy, chunk, n_max_steps, seed)
+             for chunk, seed in zip(chunks, seeds) if chunk > 0]
+
+    if processes == 1:
+        results = [_run_task(task, kwargs) for task in tasks]
+    else:
+        with mp.Pool(processes) as pool:
+            results = pool.starmap(_run_task,
+                                   [(task, kwargs) for task in tasks])
+
+    survived, rewards, settling_time, overshoot = (
+        np.concatenate(field) for field in zip(*results)
+    )
+    return {
+        'survived': survived,
+        'rewards': rewards,
+        'settling time': settling_time,
+        'overshoot': overshoot
+    }
+
+
+def _run_task(task, kwargs):
+    return _run_episodes(*task, **kwargs)
+
+
+def summarize(results, percentiles=(5, 25, 50, 75, 95)):
+    """Returns survival rate and the statistics of settling time, overshoot
+    and reward of evaluation results."""
+
+    survived = results['survived']
+    settling_time = results['settling time']
+    settled = ~np.isnan(settling_time)
+    summary = {
+        'episodes': len(survived),
+        'survival rate': survived.mean(),
+        'settled rate': settled.mean()
+    }
+
+    for key, values in (('settling time', settling_time[settled]),
+                        ('overshoot', results['overshoot'][survived]),
+                        ('rewards', results['rewards'])):
+        if len(values) == 0:
+            continue
+        summary[key] = {
+            'mean': values.mean(),
+            'std': values.std(),
+            **{f'p{p}': value for p, value in
+               zip(percentiles, np.percentile(values, percentiles))}
+        }
+    return summary
@@ -0,0 +1,125 @@
+import json
+
+import h5py
+import numpy as np
+
+
+def _linear(x):
+    return x
+
+
+def _elu(x):
+    return np.where(x > 0, x, np.expm1(np.minimum(x, 0)))
+
+
+def _sigmoid(x):
+    # Numerically stable form of 1 / (1 + exp(-x))
+    return np.exp(-np.logaddexp(0, -x))
+
+
+def _relu(x):
+    return np.maximum(x, 0)
+
+
+ACTIVATIONS = {
+    'linear': _linear,
+    'elu': _elu,
+    'sigmoid': _sigmoid,
+    'relu': _relu,
+    'tanh': np.tanh
+}
+
+
+class NumpyModel:
+    """Inference backend for trained models without TensorFlow.
+
+    Kernels, biases and activations of the Dense layers are read once from
+    the saved Keras *.h5 file. The forward pass is a chain of NumPy matmuls
+    in float32 like Keras computes it. Without path the layers are set by
+    set_weights.
+    """
+
+    def __init__(self, path=None):
+        self._layers = []
+
+        if path is None:
+            return
+
+        with h5py.File(path, 'r') as h5file:
+            config = json.loads(self._decode(h5file.attrs['model_config']))
+            weights = h5file['model_weights']
+
+            layers = config['config']
+            if isinstance(layers, dict):
+                layers = layers['layers']
+
+            for layer in layers:
+                if layer['class_name'] == 'InputLayer':
+                    continue
+                if layer['class_name'] != 'Dense':
+                    raise ValueError(
+                        f"Layer type {layer['class_name']} is not supported"
+                    )
+
+                layer_config = layer['config']
+                activation = layer_config.get('activation', 'linear')
+                if activation not in ACTIVATIONS:
+                    raise ValueError(
+                        f"Activation {activation} is not supported"
+                    )
+
+                group = weights[layer_config['name']]
+                names = [self._decode(name)
+                         for name in group.attrs['weight_names']]
+                kernel = np.asarray(group[names[0]], dtype=np.float32)
+                bias = np.zeros(kernel.shape[1], dtype=np.float32)
+                if layer_config.get('use_bias', True):
+                    bias = np.asarray(group[names[1]], dtype=np.float32)
+
+                self._layers.append((kernel, bias, ACTIVATIONS[activation]))
+
+    def set_weights(self, weights, activations=None):
+        """Sets the layers from a list of kernels and biases as returned by
+        Keras get_weights(). Activation names are kept if not given."""
+
+        if activations is None:
+            activations = [layer[2] for layer in self._layers]
+        else:
+            activations = [ACTIVATIONS[name] for name in activations]
+
+        self._layers = [
+            (np.asarray(kernel, dtype=np.float32),
+             np.asarray(bias, dtype=np.float32), activation)
+            for kernel, bias, activation in zip(weights[0::2], weights[1::2],
+                                                activations)
+        ]
+
+    def predict(self, x):
+        """Returns the outputs for a batch of inputs of shape
+        (batch, input_size)."""
+
+        x = np.asarray(x, dtype=np.float32)
+        for kernel, bias, activation in self._layers:
+            x = activation(x @ kernel + bias)
+        return x
+
+    def __call__(self, x):
+        return self.predict(x)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        return str(value)
+
+    @property
+    def kernels(self):
+        return [kernel for kernel, _, _ in self._layers]
+
+    @property
+    def input_size(self):
+        return self._layers[0][0].shape[0]
+
+    @property
+    def output_size(self):
+        return self._layers[-1][0].shape[1]
@@ -1,34 +1,32 @@
 import os
 
-import tensorflow as tf
-from tensorflow import keras
+import numpy as np
 
 from ... import pg_init
 from ... components import colors
 
 
-# Just disables the warning, doesn't enable AVX/FMA
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-
-
 class ANN:
 
     def __init__(self, model_name):
-        path = 'data\\components\\rl\\models\\' + model_name
-        model = keras.models.load_model(path, compile=False)
+        # Weights are read by the NumPy backend, loaded not before a model
+        # is selected and without TensorFlow
+        from . import inference
+
+        path = os.path.join('data', 'components', 'rl', 'models', model_name)
+        model = inference.NumpyModel(path)
 
         self._layer_sizes = []
         self._W = []
         self._max_W = []
 
         counter = 0
-        for variable in model.weights:
-            if variable.name.split('/')[1].split(':')[0] != 'bias':
-                self._W.append(variable)
-                self._max_W.append(float(tf.reduce_max(tf.math.abs(variable))))
-                s_list = list(variable.shape)
-                self._layer_sizes += s_list if counter == 0 else s_list[1:]
-                counter += 1
+        for kernel in model.kernels:
+            self._W.append(kernel)
+            self._max_W.append(float(np.max(np.abs(kernel))))
+            s_list = list(kernel.shape)
+            self._layer_sizes += s_list if counter == 0 else s_list[1:]
+            counter += 1
 
         self._nn_neurons = []
         self._connections = []
@@ -105,7 +103,7 @@ class ANN:
 
         # Set pos of connection lines between layers
         for lay_n, (w, max_w) in enumerate(zip(self._W, self._max_W)):
-            for row_n, row in enumerate(w.numpy()):
+            for row_n, row in enumerate(w):
                 for n, value in enumerate(row):
                     self._connections.append(
                         Connection(abs(value)/max_w,
@@ -2,6 +2,7 @@ import os
 
 import tensorflow as tf
 import numpy as np
+from scipy.signal import lfilter
 
 
 # Just disables the warning, doesn't enable AVX/FMA
@@ -46,6 +47,112 @@ def play_multiple_episodes(env, n_eps, n_max_steps, model, loss_fn, gym=False):
     return all_rewards, all_grads, best_ep_reward
 
 
+def play_episodes_lockstep(vec_env, n_max_steps, model, loss_fn):
+    """Plays one episode on every demonstrator of vec_env in lockstep.
+    The gradients of all running episodes are computed with one forward
+    pass and one jacobian per step."""
+
+    n_eps = vec_env.n
+    all_rewards = [[] for ep in range(n_eps)]
+    all_grads = [[] for ep in range(n_eps)]
+    running = np.ones(n_eps, dtype=bool)
+    actions = np.zeros(n_eps, dtype=int)
+
+    obs = vec_env.reset()
+    for step in range(n_max_steps):
+        eps = np.flatnonzero(running)
+        with tf.GradientTape() as tape:
+            left_proba = model(obs[eps].astype(np.float32))
+            action = (tf.random.uniform(left_proba.shape) > left_proba)
+            y_target = 1. - tf.cast(action, tf.float32)
+            loss = loss_fn(y_target, left_proba)
+        # Per episode gradients, shape (episodes, *variable.shape)
+        jacobians = tape.jacobian(loss, model.trainable_variables)
+
+        actions[eps] = action.numpy()[:, 0]
+        obs, rewards, dones = vec_env.step(actions)
+
+        for num, ep in enumerate(eps):
+            all_rewards[ep].append(float(rewards[ep]))
+            all_grads[ep].append([jacobian[num] for jacobian in jacobians])
+        running[eps[dones[eps]]] = False
+        if not running.any():
+            break
+
+    best_ep_reward = max(sum(rewards) for rewards in all_rewards)
+    return all_rewards, all_grads, best_ep_reward
+
+
+def play_multiple_episodes_recorded(env, n_eps, n_max_steps, model,
+                                    gym=False):
+    """Plays episodes with forward passes only and records observations,
+    actions and rewards for policy_gradients."""
+
+    all_obs = []
+    all_actions = []
+    all_rewards = []
+    for ep in range(n_eps):
+        current_obs = []
+        current_actions = []
+        current_rewards = []
+        obs = env.reset()
+        for step in range(n_max_steps):
+            obs = np.array(obs, dtype=np.float32).reshape(-1)
+            left_proba = model(obs[np.newaxis])
+            action = int(np.random.rand() > float(left_proba[0, 0]))
+            current_obs.append(obs)
+            current_actions.append(action)
+            if gym:
+                obs, reward, done, info = env.step(action)
+            else:
+                obs, reward, done = env.step(action)
+            current_rewards.append(float(np.sum(reward)))
+            if done:
+                break
+
+        all_obs.append(np.array(current_obs))
+        all_actions.append(np.array(current_actions))
+        all_rewards.append(current_rewards)
+
+    best_ep_reward = max(sum(rewards) for rewards in all_rewards)
+    return all_obs, all_actions, all_rewards, best_ep_reward
+
+
+def play_episodes_parallel(pool, n_eps, n_max_steps, model):
+    """Plays the episodes on the worker processes of a RolloutPool with
+    the current weights of model. Returns observations, actions and
+    rewards per episode."""
+
+    trajectories = pool.play(model.get_weights(), get_activations(model),
+                             n_eps, n_max_steps)
+    all_obs, all_actions, all_rewards = map(list, zip(*trajectories))
+    best_ep_reward = max(sum(rewards) for rewards in all_rewards)
+    return all_obs, all_actions, all_rewards, best_ep_reward
+
+
+def policy_gradients(model, loss_fn, all_obs, all_actions,
+                     all_final_rewards):
+    """Returns the mean policy gradient of all recorded steps, computed
+    with one forward and one backward pass over the whole batch."""
+
+    obs = np.concatenate(all_obs).astype(np.float32)
+    actions = np.concatenate(all_actions).astype(np.float32)
+    y_target = 1. - actions[:, np.newaxis]
+    if isinstance(all_final_rewards, list):
+        all_final_rewards = np.concatenate(all_final_rewards)
+    final_rewards = np.reshape(all_final_rewards, -1).astype(np.float32)
+    with tf.GradientTape() as tape:
+        left_proba = model(obs)
+        loss = tf.reduce_mean(final_rewards * loss_fn(y_target, left_proba))
+    return tape.gradient(loss, model.trainable_variables)
+
+
+def get_activations(model):
+    """Returns the activation names of the Dense layers of model."""
+
+    return [layer.activation.__name__ for layer in model.layers]
+
+
 def discount_rewards(rewards, discount_factor):
     discounted = np.array(rewards)
     for step in range(len(rewards) - 2, -1, -1):
@@ -53,12 +160,48 @@ def discount_rewards(rewards, discount_factor):
     return discounted
 
 
+def flatten_episodes(all_rewards):
+    """Returns the rewards of all episodes in one flat array and the
+    offsets where the episodes start, followed by the total length."""
+
+    flat_rewards = np.concatenate([np.reshape(rewards, -1)
+                                   for rewards in all_rewards])
+    lengths = [np.size(rewards) for rewards in all_rewards]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(int)
+    return flat_rewards.astype(float), offsets
+
+
+def discount_flat(flat_rewards, offsets, discount_factor):
+    """Discounts the rewards of many episodes at once. Episodes are padded
+    into rows and every row is scanned in reverse from its own end."""
+
+    flat_rewards = np.asarray(flat_rewards, dtype=float)
+    lengths = np.diff(offsets)
+    padded = np.zeros((len(lengths), lengths.max(initial=0)))
+    steps = np.arange(padded.shape[1]) < lengths[:, np.newaxis]
+    padded[steps] = flat_rewards
+
+    # Reversed rows begin with their zero padding, which leaves the filter
+    # state at zero until the last step of the episode
+    scanned = lfilter([1], [1, -discount_factor], padded[:, ::-1], axis=1)
+    return scanned[:, ::-1][steps]
+
+
+def discount_and_normalize_flat(flat_rewards, offsets, discount_factor):
+    """Returns the discounted and normalized returns of many episodes in
+    one flat array aligned with the flat rewards."""
+
+    discounted = discount_flat(flat_rewards, offsets, discount_factor)
+    if discounted.min() == discounted.max():
+        # Identical returns carry no information for the gradient
+        return np.zeros_like(discounted)
+    reward_mean = discounted.mean()
+    reward_std = discounted.std()
+    return (discounted - reward_mean) / reward_std
+
+
 def discount_and_normalize_rewards(all_rewards, discount_factor):
-    all_discounted_rewards = [discount_rewards(rewards, discount_factor)
-                              for rewards in all_rewards]
-    flat_rewards = np.concatenate(all_discounted_rewards)
-    reward_mean = flat_rewards.mean()
-    reward_std = flat_rewards.std()  # + 1e-9
-    # print("std:", reward_std)
-    return [(discount_rewards - reward_mean) / reward_std
-            for discount_rewards in all_discounted_rewards]
+    flat_rewards, offsets = flatten_episodes(all_rewards)
+    final_rewards = discount_and_normalize_flat(flat_rewards, offsets,
+                                                discount_factor)
+    return np.split(final_rewards, offsets[1:-1])
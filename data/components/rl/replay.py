@@ -0,0 +1,161 @@
+import numpy as np
+
+
+class ReplayMemory:
+    """Replay memory for deep-Q learning backed by preallocated arrays.
+
+    Experiences are written into a ring buffer of typed NumPy arrays, so
+    inserting is O(1) and a batch is sampled with one fancy index per
+    field. When capacity is reached the oldest experiences are
+    overwritten. The memory footprint is fixed at construction and given
+    by nbytes.
+    """
+
+    def __init__(self, capacity, state_size, state_dtype=np.float32):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size),
+                                    dtype=state_dtype)
+        self.dones = np.zeros(capacity, dtype=bool)
+
+        self._index = 0
+        self._size = 0
+
+    def append(self, state, action, reward, next_state, done):
+        """Stores one experience and returns its index."""
+
+        index = self._index
+        self.states[index] = np.reshape(state, -1)
+        self.actions[index] = action
+        self.rewards[index] = np.asarray(reward).item()
+        self.next_states[index] = np.reshape(next_state, -1)
+        self.dones[index] = done
+
+        self._index = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return index
+
+    def sample(self, batch_size):
+        """Returns states, actions, rewards, next_states and dones of
+        batch_size uniformly drawn experiences."""
+
+        indices = np.random.randint(self._size, size=batch_size)
+        return self[indices]
+
+    def clear(self):
+        self._index = 0
+        self._size = 0
+
+    def __getitem__(self, indices):
+        return (self.states[indices], self.actions[indices],
+                self.rewards[indices], self.next_states[indices],
+                self.dones[indices])
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        return (self.states.nbytes + self.actions.nbytes
+                + self.rewards.nbytes + self.next_states.nbytes
+                + self.dones.nbytes)
+
+
+class SumTree:
+    """Binary tree whose nodes hold the sum of the priorities below them.
+
+    Leaves are padded to a power of two and stored in one array behind the
+    inner nodes, root is at index 1. Updates and proportional sampling
+    walk all levels at once for a whole batch, each is O(log n).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._leaves = 1
+        while self._leaves < capacity:
+            self._leaves *= 2
+        self._depth = self._leaves.bit_length() - 1
+        self._tree = np.zeros(2*self._leaves)
+
+    def update(self, indices, priorities):
+        """Sets the priorities of the leaves at indices."""
+
+        nodes = np.asarray(indices) + self._leaves
+        self._tree[nodes] = priorities
+        for level in range(self._depth):
+            nodes = np.unique(nodes // 2)
+            self._tree[nodes] = (self._tree[2*nodes]
+                                 + self._tree[2*nodes + 1])
+
+    def find(self, values):
+        """Returns the leaf indices where the cumulative priority reaches
+        values."""
+
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for level in range(self._depth):
+            left = 2*nodes
+            right = values > self._tree[left]
+            values -= np.where(right, self._tree[left], 0)
+            nodes = left + right
+        return nodes - self._leaves
+
+    def __getitem__(self, indices):
+        return self._tree[np.asarray(indices) + self._leaves]
+
+    @property
+    def total(self):
+        return self._tree[1]
+
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """Replay memory that samples experiences proportional to their
+    priority (|TD error| + epsilon)**alpha.
+
+    New experiences get the highest priority seen so far. Sampling returns
+    the indices for update_priorities and importance-sampling weights,
+    normalized to a maximum of one, which correct the bias for
+    beta = 1.
+    """
+
+    def __init__(self, capacity, state_size, state_dtype=np.float32,
+                 alpha=0.6, beta=0.4, epsilon=1e-6):
+        ReplayMemory.__init__(self, capacity, state_size, state_dtype)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self._tree = SumTree(capacity)
+        self._max_priority = 1.0
+
+    def append(self, state, action, reward, next_state, done):
+        index = ReplayMemory.append(self, state, action, reward, next_state,
+                                    done)
+        self._tree.update([index], self._max_priority)
+        return index
+
+    def sample_weighted(self, batch_size):
+        """Returns a batch of experiences, their indices and their
+        importance-sampling weights. Draws are stratified over equal
+        segments of the total priority."""
+
+        total = self._tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + np.random.rand(batch_size))*segment
+        indices = np.minimum(self._tree.find(values), len(self) - 1)
+
+        probabilities = self._tree[indices] / total
+        weights = (len(self)*probabilities)**-self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        return self[indices], indices, weights
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + self.epsilon)**self.alpha
+        self._tree.update(indices, priorities)
+        self._max_priority = max(self._max_priority, priorities.max())
+
+    def clear(self):
+        ReplayMemory.clear(self)
+        self._tree = SumTree(self.capacity)
+        self._max_priority = 1.0
@@ -0,0 +1,86 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from . import environment as env_
+from . inference import NumpyModel
+
+
+# Every worker process holds its own environment and policy copy
+_env = None
+_policy = None
+
+
+def _init_worker(env_kwargs):
+    global _env, _policy
+    _env = env_.Environment(**env_kwargs)
+    _policy = NumpyModel()
+
+
+def _play_episodes(weights, activations, n_eps, n_max_steps, seed):
+    """Plays episodes with the given policy weights and returns their
+    observations, actions and rewards."""
+
+    np.random.seed(seed)
+    _policy.set_weights(weights, activations)
+
+    trajectories = []
+    for ep in range(n_eps):
+        obs = _env.reset()
+        ep_obs = np.zeros((n_max_steps, obs.size), dtype=np.float32)
+        ep_actions = np.zeros(n_max_steps, dtype=np.int8)
+        ep_rewards = []
+        for step in range(n_max_steps):
+            ep_obs[step] = obs.reshape(-1)
+            left_proba = _policy.predict(ep_obs[step:step+1])[0, 0]
+            action = int(np.random.rand() > left_proba)
+            obs, reward, done = _env.step(action)
+            ep_actions[step] = action
+            ep_rewards.append(float(np.sum(reward)))
+            if done:
+                break
+
+        steps = len(ep_rewards)
+        trajectories.append((ep_obs[:steps], ep_actions[:steps], ep_rewards))
+    return trajectories
+
+
+class RolloutPool:
+    """Plays the episodes of a policy gradient iteration on worker
+    processes.
+
+    Every worker holds its own Environment and a NumPy copy of the policy,
+    which is synchronized with the weights passed to play. Workers only
+    return trajectories, gradients are computed by the main process.
+
+    Workers are forked where possible, so the pool must be created before
+    TensorFlow builds a model and starts its runtime threads. With spawn,
+    as on Windows, they import the main script and its TensorFlow imports
+    again.
+    """
+
+    def __init__(self, processes=None, **env_kwargs):
+        self.processes = processes or mp.cpu_count()
+        context = mp.get_context()
+        if 'fork' in mp.get_all_start_methods():
+            context = mp.get_context('fork')
+        self._pool = context.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(env_kwargs,))
+
+    def play(self, weights, activations, n_eps, n_max_steps):
+        """Spreads n_eps episodes over the workers and returns a list of
+        (observations, actions, rewards) per episode. Weights and
+        activation names are those of the policy model."""
+
+        chunks = [len(chunk) for chunk in
+                  np.array_split(np.arange(n_eps), self.processes)]
+        seeds = np.random.randint(2**31, size=len(chunks))
+        tasks = [(weights, activations, chunk, n_max_steps, seed)
+                 for chunk, seed in zip(chunks, seeds) if chunk > 0]
+
+        results = self._pool.starmap(_play_episodes, tasks)
+        return [trajectory for chunk in results for trajectory in chunk]
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+
+class SpriteCache:
+    """LRU cache of pre-rendered sprites with a memory bound.
+
+    A sprite is a surface with the offset at which it is blitted relative
+    to its anchor point. Sprites are rendered on the first request of their
+    key and dropped least recently used first, when their pixel data
+    exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=32*2**20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+
+    def get(self, key, render):
+        """Returns the sprite of key, render is called to create it as
+        (surface, offset) if it isn't cached."""
+
+        if key in self._sprites:
+            self.hits += 1
+            self._sprites.move_to_end(key)
+            return self._sprites[key]
+
+        self.misses += 1
+        sprite = render()
+        self._sprites[key] = sprite
+        self.nbytes += self._size(sprite[0])
+        while self.nbytes > self.max_bytes and len(self._sprites) > 1:
+            _, (surface, _) = self._sprites.popitem(last=False)
+            self.nbytes -= self._size(surface)
+        return sprite
+
+    def blit(self, surface, key, render, anchor):
+        """Blits the sprite of key with its offset to anchor and returns
+        the affected rect."""
+
+        sprite, offset = self.get(key, render)
+        return surface.blit(sprite, (anchor[0] + offset[0],
+                                     anchor[1] + offset[1]))
+
+    def clear(self):
+        self._sprites.clear()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    @staticmethod
+    def _size(surface):
+        width, height = surface.get_size()
+        return width*height*surface.get_bytesize()
+
+
+def new_layer(width, height):
+    """Returns a transparent surface for a sprite."""
+
+    layer = pg.Surface((width, height), pg.SRCALPHA)
+    if pg.display.get_surface() is not None:
+        layer = layer.convert_alpha()
+    layer.fill((0, 0, 0, 0))
+    return layer
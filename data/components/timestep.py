@@ -0,0 +1,39 @@
+class FixedTimestep:
+    """Accumulates elapsed wall-clock time and hands it out in fixed steps.
+
+    Time that is left over after the last full step is kept for the next
+    frame, alpha is its fraction of a step and can be used to interpolate
+    between the last two simulated states. Frames longer than max_steps
+    steps drop the excess time, so a slow frame cannot cause a spiral of
+    ever more steps.
+    """
+
+    def __init__(self, rate, max_steps=8):
+        self.rate = rate
+        self.max_steps = max_steps
+        self._acc = 0.0
+
+    def advance(self, elapsed_ms):
+        """Adds the elapsed time in milliseconds and returns the number of
+        fixed steps due."""
+
+        step_ms = self.step_ms
+        self._acc = min(self._acc + elapsed_ms, self.max_steps*step_ms)
+        steps = int(self._acc // step_ms)
+        self._acc -= steps*step_ms
+        return steps
+
+    def reset(self):
+        self._acc = 0.0
+
+    @property
+    def dt(self):
+        return 1 / self.rate
+
+    @property
+    def step_ms(self):
+        return 1000 / self.rate
+
+    @property
+    def alpha(self):
+        return self._acc / self.step_ms
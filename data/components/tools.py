@@ -4,6 +4,17 @@ import pygame as pg
 def draw_aafilled_polygon(surface, points, color):
     pg.gfxdraw.aapolygon(surface, points, color)
     pg.gfxdraw.filled_polygon(surface, points, color)
+    return bounding_rect(points)
+
+
+def bounding_rect(points, margin=1):
+    """Returns the rect enclosing all points, enlarged by margin."""
+
+    xs = [point[0] for point in points]
+    ys = [point[1] for point in points]
+    left, top = int(min(xs)) - margin, int(min(ys)) - margin
+    return pg.Rect(left, top, int(max(xs)) + margin + 1 - left,
+                   int(max(ys)) + margin + 1 - top)
 
 
 def draw_aafilled_circle(surface, x, y, r, color):
@@ -0,0 +1,6 @@
+SCREEN_SIZE = (1024, 600)
+ORIGINAL_CAPTION = "Kugel-Kegel-Demonstrator"
+SCALE = 200  # Pixels that will be equivalent to 1 meter
+FPS = (66.0, 110.0)  # Will be 60 or 100 FPS in game
+# Physics ticks per second of the game, independent of the display FPS
+PHYSICS_FPS = 100
@@ -1,5 +1,9 @@
+from queue import Queue
 from threading import Thread
 
+import numpy as np
+from scipy.linalg import expm
+
 
 def euler_method(A, B, state_vec, t_vec, fps, steps_per_frame, game_step,
                  control_object=None, interference=0, reference=(0, 0),
@@ -75,6 +79,159 @@ def euler_method(A, B, state_vec, t_vec, fps, steps_per_frame, game_step,
             return x1[k], x2[k], x3[k], x4[k], over
 
 
+def zero_order_hold(A, B, T):
+    """Returns the exact discretization Ad = expm(A*T) and
+    Bd = (integral of expm(A*s) from 0 to T)*B of a continuous system with
+    one input that is held constant during the sample time T."""
+
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float).reshape(-1)
+    n = len(A)
+
+    # Both result from the exponential of the augmented matrix [[A, B], [0, 0]]
+    M = np.zeros((n+1, n+1))
+    M[:n, :n] = A
+    M[:n, n] = B
+    E = expm(M*T)
+    return E[:n, :n], E[:n, n]
+
+
+class Integrator:
+    """Matrix form of the Euler-Method working on a contiguous (T, 4) state
+    array with plain ndarray A and B.
+
+    Every mini step is one matrix-vector product x[k+1] = Phi x[k] + u with
+    Phi = I + dt*A and the input u which is constant during one frame. The
+    powers of Phi are precomputed, so all mini steps of a frame are written
+    into the state array at once.
+    """
+
+    def __init__(self):
+        self._A = None
+        self._B = None
+        self._fps = None
+        self._n = None
+        self._source = None
+
+    def setup(self, A, B, fps, steps_per_frame):
+        """Sets system and timing. Transitions are only recomputed if
+        anything has changed since the last call."""
+
+        # Cached system matrices are passed as the very same objects
+        if (self._source is not None and self._source[0] is A
+                and self._source[1] is B and fps == self._fps
+                and steps_per_frame == self._n):
+            return
+        self._source = A, B
+
+        A = np.asarray(A, dtype=float)
+        B = np.asarray(B, dtype=float).reshape(-1)
+        if (self._A is not None and fps == self._fps
+                and steps_per_frame == self._n
+                and np.array_equal(A, self._A)
+                and np.array_equal(B, self._B)):
+            return
+
+        self._A, self._B = A, B
+        self._fps, self._n = fps, steps_per_frame
+        self._dt = 1 / (fps*steps_per_frame)
+        self._Phi = np.eye(len(A)) + self._dt*A
+        self._Gam = self._dt*B
+
+        # Stacked multi step transitions Phi^j and input sums
+        # Phi^0 + ... + Phi^(j-1) for j = 1 ... steps_per_frame
+        self._powers = np.empty((steps_per_frame, *A.shape))
+        self._sums = np.empty((steps_per_frame, *A.shape))
+        power = np.eye(len(A))
+        total = np.zeros(A.shape)
+        for j in range(steps_per_frame):
+            total = total + power
+            power = self._Phi @ power
+            self._powers[j] = power
+            self._sums[j] = total
+
+    def transition(self, steps=None):
+        """Returns the transition matrix and input vector over a number of
+        mini steps (one frame by default): x[k+n] = Phi_n x[k] + Gam_n*force.
+        """
+
+        if steps is None:
+            steps = self._n
+        if steps == 0:
+            return np.eye(len(self._A)), np.zeros(len(self._A))
+        return self._powers[steps-1], self._sums[steps-1] @ self._Gam
+
+    def input_vec(self, force=None, reference=(0, 0)):
+        """Returns the input u of one mini step. Without force the system
+        is driven towards the reference state."""
+
+        if force is not None:
+            return self._Gam*force
+        reference_pos, reference_ang = reference
+        ref = np.array([reference_pos, 0, reference_ang, 0], dtype=float)
+        return ref - self._Phi @ ref
+
+    def frame(self, states, t_vec, game_step, control_object=None,
+              interference=0, reference=(0, 0), extra_physics=None,
+              force=None):
+        """Calculates one frame beginning at row game_step of states.
+        Arguments and return values are the same as of euler_method. A given
+        force replaces the force of the control object."""
+
+        t_vec = t_vec.reshape(-1)
+        sim_length = len(states) - 1
+        k = game_step
+
+        steps = min(self._n, sim_length - 1 - k)
+        over = steps < self._n
+        if steps <= 0:
+            return self._get_obs(states[k]) + (over,)
+
+        if control_object is None:
+            force = None
+        elif force is None:
+            force = control_object.force
+        u = self.input_vec(force, reference)
+
+        if extra_physics is not None and extra_physics.crashed:
+            # Cone is pinned to the crash location every mini step
+            for step in range(steps):
+                x = states[k+step]
+                extra_physics.record(*x)
+                x[0] = extra_physics.crash_loc
+                x[1] = 0
+                if control_object is not None:
+                    control_object.stop()
+                if step == 0:
+                    x[2] += extra_physics.impuls
+                    x[3] += interference
+                states[k+step+1] = self._Phi @ x + u
+        else:
+            states[k, 3] += interference
+            states[k+1:k+steps+1] = (self._powers[:steps] @ states[k]
+                                     + self._sums[:steps] @ u)
+
+        t_vec[k+1:k+steps+1] = t_vec[k] + self._dt*np.arange(1, steps+1)
+
+        if over:
+            return self._get_obs(states[k+steps]) + (over,)
+        return self._get_obs(states[k+steps-1]) + (over,)
+
+    @staticmethod
+    def _get_obs(x):
+        # (1,)-shaped views like the rows of the column vectors
+        # used by euler_method
+        return x[0:1], x[1:2], x[2:3], x[3:4]
+
+    @property
+    def dt(self):
+        return self._dt
+
+    @property
+    def steps_per_frame(self):
+        return self._n
+
+
 class EulerThread(Thread):
     """Subclass of Thread
 
@@ -97,3 +254,65 @@ class EulerThread(Thread):
     def join(self, *args):
         Thread.join(self, *args)
         return self._return
+
+
+class EulerWorker(Thread):
+    """Long-lived thread that calculates frames on request.
+
+    Synchronization contract: submit() hands over all inputs of one frame,
+    i.e. force, interference, reference state and crash handler as they are
+    at that moment. From submit() until collect() has returned the worker
+    owns the state buffers, the control object, the crash handler and the
+    integrator. The caller must not modify them in this period, inputs
+    changed after submit() apply to the next frame. Therefore the frame
+    k+1 can be calculated while the frame k is drawn.
+    """
+
+    def __init__(self, target=euler_method, name='EulerWorker'):
+        Thread.__init__(self, name=name, daemon=True)
+        self._target = target
+        self._requests = Queue(maxsize=1)
+        self._results = Queue(maxsize=1)
+        self._pending = False
+
+    def run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            args, kwargs = request
+            try:
+                result = self._target(*args, **kwargs)
+            except Exception as error:
+                result = error
+            self._results.put(result)
+
+    def submit(self, *args, **kwargs):
+        """Requests the calculation of the next frame."""
+
+        if self._pending:
+            raise RuntimeError("Result of last frame was not collected")
+        self._pending = True
+        self._requests.put((args, kwargs))
+
+    def collect(self):
+        """Waits for the requested frame and returns its result."""
+
+        result = self._results.get()
+        self._pending = False
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def stop(self):
+        """Discards a pending frame and ends the thread."""
+
+        if self._pending:
+            self._results.get()
+            self._pending = False
+        self._requests.put(None)
+        self.join()
+
+    @property
+    def pending(self):
+        return self._pending
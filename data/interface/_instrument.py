@@ -1,6 +1,7 @@
 import pygame as pg
 
 from . _instr_group import _InstrumentGroup
+from .. import pg_root
 from .. components import colors, tools
 
 
@@ -155,9 +156,6 @@ class _Instrument:
         text_color = self.settings['active value color']
         if not self.active:
             text_color = self.settings['deactive value color']
-        self.value_label.cache_font('Liberation Sans', self.value_label.size,
-                                    only_font=True)
-        font = self.value_label.font_cache
 
         dec = self._settings['decimal places']
         text_str = f'{round(self.value, dec)}'
@@ -168,7 +166,8 @@ class _Instrument:
                 # No space between instrument value and instrument unit
                 text_str = f'{round(self.value, dec)}{self.unit}'
 
-        text = font.render(text_str, True, text_color)
+        text = pg_root._State.render_font(text_str, 'Liberation Sans',
+                                          self.value_label.size, text_color)
 
         if type(self).__name__ == 'ControlKnob':
             rect = text.get_rect(center=self.ring.center)
@@ -1,12 +1,8 @@
 import os
 import pygame as pg
 from . import pg_root
-
-
-SCREEN_SIZE = (1024, 600)
-ORIGINAL_CAPTION = "Kugel-Kegel-Demonstrator"
-SCALE = 200  # Pixels that will be equivalent to 1 meter
-FPS = (66.0, 110.0)  # Will be 60 or 100 FPS in game
+from . constants import (SCREEN_SIZE, ORIGINAL_CAPTION, SCALE, FPS,
+                         PHYSICS_FPS)
 
 # Initialization
 pg.init()
@@ -1,4 +1,5 @@
 import os
+from collections import OrderedDict
 
 import pygame as pg
 import pygame.gfxdraw
@@ -59,6 +60,7 @@ class PygameApp:
             self.fps = pg_init.FPS[idx]
 
         self.state.static_fps = int(round(self.fps / 1.1))
+        self.state.frame_time = self.clock.get_time()
 
         self.state.update(self.screen)
 
@@ -114,7 +116,10 @@ class PygameApp:
             self.event_handler()
             self.mouse_handler(mouse)
             self.update()
-            pg.display.update()
+            if self.state.dirty_rects is None:
+                pg.display.update()
+            else:
+                pg.display.update(self.state.dirty_rects)
             if self.show_fps:
                 fps = self.clock.get_fps()
                 with_fps = "{} - {:.2f} FPS [{}]" \
@@ -122,6 +127,109 @@ class PygameApp:
                 pg.display.set_caption(with_fps)
 
 
+class FontCache:
+    """Registry of loaded fonts and LRU cache of rendered text surfaces.
+
+    Fonts are loaded once per name and size. Rendered texts are kept by
+    text, font, size and color, at most maxsize of them, and shared by all
+    states and interface widgets, so cached surfaces must not be drawn on.
+    Hits and misses count the text lookups.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts = {}
+        self._texts = OrderedDict()
+
+    def get_font(self, name, size):
+        key = name, size
+        if key not in self._fonts:
+            if name in pg_init.FONTS:
+                font = pg.font.Font(pg_init.FONTS[name], size)
+            else:
+                font = pg.font.SysFont(name, size)
+            self._fonts[key] = font
+        return self._fonts[key]
+
+    def render(self, text, font_name, size, color):
+        key = text, font_name, size, tuple(color)
+        if key in self._texts:
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return self._texts[key]
+
+        self.misses += 1
+        surface = self.get_font(font_name, size).render(text, True, color)
+        self._texts[key] = surface
+        if len(self._texts) > self.maxsize:
+            self._texts.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._texts.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._texts)
+
+
+font_cache = FontCache()
+
+
+class OverlayPool:
+    """Long-lived alpha layers for overlays.
+
+    A layer is allocated once per name and size and handed out again on
+    every frame, cleared only in the region marked as used before. Static
+    overlays are rendered once per key and kept as (surface, offset).
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self._used = {}
+        self._static = {}
+
+    def layer(self, name, size):
+        """Returns the transparent layer of name with size."""
+
+        layer = self._layers.get(name)
+        if layer is None or layer.get_size() != tuple(size):
+            layer = pg.Surface(size, pg.SRCALPHA)
+            layer.fill((0, 0, 0, 0))
+            self._layers[name] = layer
+        elif name in self._used:
+            layer.fill((0, 0, 0, 0), self._used[name])
+        self._used.pop(name, None)
+        return layer
+
+    def use(self, name, rect):
+        """Marks rect of the layer as drawn, it is cleared on the next
+        request."""
+
+        if name in self._used:
+            rect = self._used[name].union(rect)
+        self._used[name] = pg.Rect(rect)
+
+    def static(self, key, render):
+        """Returns the overlay of key, render creates it as
+        (surface, offset)."""
+
+        if key not in self._static:
+            self._static[key] = render()
+        return self._static[key]
+
+    def clear(self):
+        self._layers.clear()
+        self._used.clear()
+        self._static.clear()
+
+
+overlays = OverlayPool()
+
+
 class _State:
     """This is a prototype class for States
 
@@ -138,9 +246,14 @@ class _State:
         self.previous = None
         self.persist = {}
 
-        self.hudfont = pg.font.SysFont('Consolas', 12)
+        self.hudfont = font_cache.get_font('Consolas', 12)
         self.static_fps = None
+        # Wall-clock time of the last frame in milliseconds
+        self.frame_time = 0
         self.screenshot = None
+        self._screenshot_small = None
+        # Display regions changed by the last update, None for all
+        self.dirty_rects = None
 
         self._loaded = False
 
@@ -168,11 +281,28 @@ class _State:
         self.done = False
         return self.persist
 
-    def save_screen(self, surface):
-        """Saves the screenshot of a State to self.screenshot variable."""
-
-        i_str = pg.image.tostring(surface, 'RGB')
-        self.screenshot = pg.image.fromstring(i_str, pg_init.SCREEN_SIZE, 'RGB')
+    def save_screen(self, surface, blur=None):
+        """Saves the screenshot of a State to self.screenshot variable. The
+        surface is allocated once and overwritten by later screenshots.
+        Blur blurs it by smoothscaling down by that factor and back up,
+        e.g. for a menu backdrop."""
+
+        size = surface.get_size()
+        if self.screenshot is None or self.screenshot.get_size() != size:
+            self.screenshot = surface.copy()
+        else:
+            self.screenshot.blit(surface, (0, 0))
+
+        if blur is not None and blur > 1:
+            small_size = max(1, size[0]//blur), max(1, size[1]//blur)
+            if (self._screenshot_small is None
+                    or self._screenshot_small.get_size() != small_size):
+                self._screenshot_small = pg.Surface(small_size, 0,
+                                                    self.screenshot)
+            pg.transform.smoothscale(self.screenshot, small_size,
+                                     self._screenshot_small)
+            pg.transform.smoothscale(self._screenshot_small, size,
+                                     self.screenshot)
 
     def mouse_logic(self, mouse):
         """Process mouse position that were passed from the main event loop.
@@ -208,18 +338,14 @@ class _State:
     def get_font(name, size):
         """Returns a font only."""
 
-        if name in pg_init.FONTS:
-            font = pg_init.FONTS[name]
-            return pg.font.Font(font, size)
-        return pg.font.SysFont(name, size)
+        return font_cache.get_font(name, size)
 
     @staticmethod
     def render_font(text, font_name, size, color, center=None):
         """Returns the rendered font surface and its rect centered on center,
         if required."""
 
-        font = _State.get_font(font_name, size)
-        text = font.render(text, True, color)
+        text = font_cache.render(text, font_name, size, color)
         if center is not None:
             rect = text.get_rect(center=center)
             return text, rect
@@ -1,32 +1,52 @@
+from collections import OrderedDict
+
 import numpy as np
 
+from data import euler
 from data.components import demonstrator as demo
 from data.components import controller as cnt
+from data.components import design
 
 
 class SimData:
 
-    def __init__(self, sim_length, initial_state=(0, 0, 0, 0.3)):
+    def __init__(self, sim_length, initial_state=(0, 0, 0, 0.3), width=4):
         self.sim_length = sim_length
 
-        x1 = np.zeros((self.sim_length+1, 1))
-        x2 = np.zeros((self.sim_length+1, 1))
-        x3 = np.zeros((self.sim_length+1, 1))
-        x4 = np.zeros((self.sim_length+1, 1))
+        # Columns beyond the 4 states can hold constant extras like the
+        # reference state
+        self.states = np.zeros((self.sim_length+1, width))
+        self.t_vec = np.zeros((self.sim_length+1, 1))
 
-        # Initial Conditions
-        x1[0] = initial_state[0]  # x -- traveled distance
-        x2[0] = initial_state[1]  # x' -- velocity
-        x3[0] = initial_state[2]  # ω -- angle
-        x4[0] = initial_state[3]  # ω' -- angular veloctiy
+        # Column views x1, x2, x3, x4 on the contiguous state array
+        self.state_vec = tuple(self.states[:, i:i+1] for i in range(4))
 
-        self.state_vec = x1, x2, x3, x4
-        self.t_vec = np.zeros((self.sim_length+1, 1))
+        self.reset(initial_state)
+
+    def reset(self, initial_state):
+        """Sets new initial conditions, so the buffers can be reused for
+        another run. Rows after the first are overwritten while running."""
+
+        # Initial Conditions
+        self.states[0, 0] = initial_state[0]  # x -- traveled distance
+        self.states[0, 1] = initial_state[1]  # x' -- velocity
+        self.states[0, 2] = initial_state[2]  # ω -- angle
+        self.states[0, 3] = initial_state[3]  # ω' -- angular veloctiy
+        extras = initial_state[4:self.states.shape[1]]
+        self.states[0, 4:4+len(extras)] = extras
+        self.t_vec[0] = 0
 
 
 class StateSpaceModel:
+    """State space model of the demonstrator with a state feedback
+    controller.
+
+    Closed loop matrix, poles and the discretized transitions are cached by
+    controller gains, least recently used entries are evicted beyond
+    cache_size. Cached arrays are shared and must not be modified.
+    """
 
-    def __init__(self):
+    def __init__(self, cache_size=64):
         # Initialize Kegel-Kugel-Demonstrator as k_k
         self.k_k = demo.Demonstrator(
             mass_sphere=19.5,
@@ -43,16 +63,126 @@ class StateSpaceModel:
         self.k_k.statespace()
 
         default_Kregs = -1296.6, -3161.2, -31800, -9831
-        self.controller = cnt.StateSpaceController(*default_Kregs)
+        self._Kregs = None
+        self.set_Kregs(*default_Kregs)
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
 
     def update(self):
-        self.system = (self.k_k.ss_A - self.k_k.ss_B*self.controller.ss_K)
+        self.system = self.closed_loop()
 
     def set_Kregs(self, k1, k2, k3, k4):
-        self.controller = cnt.StateSpaceController(k1, k2, k3, k4)
+        Kregs = float(k1), float(k2), float(k3), float(k4)
+        if Kregs != self._Kregs:
+            self.controller = cnt.StateSpaceController(*Kregs)
+            self._Kregs = Kregs
 
     def get_poles(self):
-        return np.linalg.eig(self.system)[0]
+        return self._cached(('poles', self.Kregs),
+                            lambda: np.linalg.eig(self.closed_loop())[0])
+
+    def closed_loop(self):
+        """Returns the closed loop system matrix A - B*K."""
+
+        return self._cached(
+            ('system', self.Kregs),
+            lambda: self.k_k.ss_A - self.k_k.ss_B*self.controller.ss_K
+        )
+
+    def discretize(self, T):
+        """Returns the exact zero-order-hold transition (Ad, Bd) of the
+        closed loop system A - B*K for the period T, so that one frame is a
+        single update x[k+1] = Ad x[k] + Bd*force."""
+
+        return self._cached(
+            ('zoh', self.Kregs, T),
+            lambda: euler.zero_order_hold(self.closed_loop(), self.B, T)
+        )
+
+    def euler_transition(self, fps, steps_per_frame):
+        """Returns the transition (Phi_n, Gam_n) of one frame of the
+        Euler-Method for the closed loop system."""
+
+        def compute():
+            integrator = euler.Integrator()
+            integrator.setup(self.closed_loop(), self.B, fps,
+                             steps_per_frame)
+            return integrator.transition()
+
+        return self._cached(('euler', self.Kregs, fps, steps_per_frame),
+                            compute)
+
+    def euler_error(self, T, steps_per_frame):
+        """Returns the relative error of the Euler-Method's transition over
+        one period T against the exact one, for state and input."""
+
+        Ad, Bd = self.discretize(T)
+        Phi_n, Gam_n = self.euler_transition(1 / T, steps_per_frame)
+        state_error = np.linalg.norm(Phi_n - Ad) / np.linalg.norm(Ad)
+        input_error = np.linalg.norm(Gam_n - Bd) / np.linalg.norm(Bd)
+        return state_error, input_error
+
+    def place(self, poles):
+        """Returns the gains which place the closed loop poles at poles,
+        cached by pole locations."""
+
+        poles = tuple(sorted((complex(pole) for pole in np.ravel(poles)),
+                             key=lambda pole: (pole.real, pole.imag)))
+        return self._cached(
+            ('place', poles),
+            lambda: tuple(design.ackermann(self.A, self.B, poles).tolist())
+        )
+
+    def lqr(self, Q, R):
+        """Returns the gains of the linear quadratic regulator for the
+        weights Q and R, cached by weights."""
+
+        Q = np.atleast_2d(np.asarray(Q, dtype=float))
+        R = np.atleast_2d(np.asarray(R, dtype=float))
+        return self._cached(
+            ('lqr', tuple(Q.ravel()), tuple(R.ravel())),
+            lambda: tuple(design.lqr(self.A, self.B, Q, R).tolist())
+        )
+
+    def stability_map(self, gains, chunk_size=100_000):
+        """Evaluates the closed loop poles for many gain vectors at once.
+        gains is a (M, 4) array. Returns per gain vector the stability
+        margin (negative real part of the dominant pole, positive when
+        stable), the smallest damping ratio and the dominant pole."""
+
+        gains = np.atleast_2d(np.asarray(gains, dtype=float))
+        A = np.asarray(self.A, dtype=float)
+        B = np.asarray(self.B, dtype=float).reshape(-1, 1)
+
+        margin = np.empty(len(gains))
+        damping = np.empty(len(gains))
+        dominant = np.empty(len(gains), dtype=complex)
+        # Chunks keep the stacked (M, 4, 4) systems small in memory
+        for start in range(0, len(gains), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            systems = A - B*gains[chunk, np.newaxis, :]
+            poles = np.linalg.eigvals(systems)
+
+            rows = np.arange(len(poles))
+            dominant[chunk] = poles[rows, np.argmax(poles.real, axis=1)]
+            magnitude = np.abs(poles)
+            ratio = np.divide(-poles.real, magnitude,
+                              out=np.zeros(poles.shape), where=magnitude > 0)
+            damping[chunk] = ratio.min(axis=1)
+        margin[:] = -dominant.real
+        return margin, damping, dominant
+
+    def _cached(self, key, compute):
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        value = compute()
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
 
     @property
     def A(self):
@@ -65,3 +195,36 @@ class StateSpaceModel:
     @property
     def K(self):
         return self.controller.ss_K
+
+    @property
+    def Kregs(self):
+        return self._Kregs
+
+
+def gain_grid(*axes):
+    """Returns all combinations of the gain values on the axes as a
+    (M, 4) array, the last axis varies fastest."""
+
+    grid = np.meshgrid(*[np.atleast_1d(axis) for axis in axes],
+                       indexing='ij')
+    return np.stack([g.ravel() for g in grid], axis=1)
+
+
+def sample_gains(ranges, n):
+    """Returns n uniformly sampled gain vectors within the ranges."""
+
+    low, high = np.array(ranges, dtype=float).T
+    return np.random.uniform(low, high, size=(n, len(ranges)))
+
+
+if __name__ == '__main__':
+    # Error of the Euler-Method against the exact discretization
+    model = StateSpaceModel()
+    for Kregs in [model.Kregs, (0, 0, 0, 0)]:
+        model.set_Kregs(*Kregs)
+        print('K =', Kregs)
+        for fps in [60, 100, 20]:
+            for steps in [1, 5, 10, 20, 50, 100]:
+                state_error, input_error = model.euler_error(1 / fps, steps)
+                print(f'\t{fps} fps, {steps:3} steps/frame: '
+                      + f'state {state_error:.2e}, input {input_error:.2e}')
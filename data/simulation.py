@@ -0,0 +1,191 @@
+import math as m
+
+import numpy as np
+
+from . import constants, setup_sim, euler
+from . components import newton
+from . components.timestep import FixedTimestep
+from . components.objects import Cone, Sphere, Ground
+
+
+class Simulation:
+    """Headless core of the GAME state.
+
+    Runs the game semantics without pygame display or resources: Euler
+    method in fixed physics ticks, the cone crashing into the walls given
+    by limitations, the controller switched off beyond a tilt of 20° and
+    the ball drop by gPhysics beyond 60°. The GAME state delegates its
+    physics to it and only draws the objects.
+    """
+
+    def __init__(self, Kregs=(0, 0, 0, 0), initial_state=(0, 0, 0, 0.3),
+                 limitations=(0.56, 0.56), mode='ss_controller',
+                 control_object=None, euler_ministeps=10,
+                 physics_fps=constants.PHYSICS_FPS,
+                 sim_length=120_000):
+        self.limitations = limitations
+        self.mode = mode
+        self.control_object = control_object
+        self.euler_ministeps = euler_ministeps
+        self.force_records = []
+
+        width = constants.SCREEN_SIZE[0]
+        self.sim = setup_sim.SimData(sim_length, initial_state)
+        self.model = setup_sim.StateSpaceModel()
+        self.model.set_Kregs(*Kregs)
+        self.model.update()
+        self.integrator = euler.Integrator()
+        self.timestep = FixedTimestep(rate=physics_fps)
+
+        # Game objects are needed for wall limits and the ball drop
+        self.ground = Ground(510, width, thickness=10)
+
+        self.cone = Cone(basis_length=constants.SCALE,
+                         basis_center_x=width//2,
+                         ratio=0.85)
+
+        self.ball = Sphere(
+            radius=round(self.model.k_k.radius*constants.SCALE),
+            mass=self.model.k_k.mass_sphere,
+            inertia=self.model.k_k.J,
+            zero_pos_x=self.cone.get_zero_pos()
+        )
+
+        self.crasher = newton.CrashHandler(self.cone)
+        self.physics = None
+
+        self.step = 0
+        self.simover = False
+        self.ball_drops = False
+
+        self.place(initial_state)
+
+    def tick(self, interference=0.0, reference=(0, 0), force=None):
+        """Simulates one physics tick with the Euler method and applies
+        the wall and tilt checks. Returns the new state."""
+
+        self.integrator.setup(self.model.system, self.model.B,
+                              self.timestep.rate, self.euler_ministeps)
+        x1, x2, x3, x4, self.simover = self.integrator.frame(
+            self.sim.states, self.sim.t_vec, self.step, self.control_object,
+            interference, reference, self.crasher, force=force
+        )
+
+        if self.mode == 'agent':
+            ref_x = np.array([reference[0]])
+            self.control_object.observe(np.array([x1, x2, x3, x4, ref_x]))
+
+        # Location limit check
+        x_max = (constants.SCREEN_SIZE[0]//2) / constants.SCALE
+        cone_len = self.cone.size / constants.SCALE
+        x_limit_left = x_max - self.limitations[0] - cone_len/2
+        x_limit_right = x_max - self.limitations[1] - cone_len/2
+        if (x1 < -x_limit_left) or (x1 > x_limit_right):
+            # If cone touches wall, cone will stop
+            self.crasher.crashed = True
+            self.model.set_Kregs(0, 0, 0, 0)
+            self.model.update()
+
+        # Ball tilting check
+        if abs(x3) > m.radians(20):
+            # If ball tilt angle > 20°
+            # System stops controlling, controller values set to zero
+            self.model.set_Kregs(0, 0, 0, 0)
+            self.model.update()
+
+        if abs(x3) > m.radians(60):
+            # If ball tilt angle > 60°
+            # Ball will start falling and shall roll down the cone
+            self.ball_drops = True
+
+        if not self.ball_drops:
+            if self.mode == 'agent':
+                self.control_object.update()
+
+            if not self.simover:
+                self.step += self.euler_ministeps
+
+            if self.control_object is not None:
+                if force is None:
+                    force = self.control_object.force
+                self.force_records.append(force)
+
+        return np.concatenate((x1, x2, x3, x4))
+
+    def advance(self, ticks, interference=0.0, reference=(0, 0),
+                force=None):
+        """Runs the physics ticks and returns the state after each tick,
+        whether the simulation is over and whether the ball falls.
+        Interference is applied to the first tick only."""
+
+        states = []
+        for tick in range(ticks):
+            if self.ball_drops:
+                break
+            states.append(self.tick(interference, reference, force))
+            interference = 0.0
+        return states, self.simover, self.ball_drops
+
+    def place(self, state):
+        """Moves cone and ball to the positions of a state."""
+
+        x1, _, x3, x4 = state[:4]
+        self.cone.update(float(x1))
+        self.ball.update(self.cone.get_points('top'), float(x3), float(x4))
+
+    def drop(self):
+        """Simulates one step of the falling ball."""
+
+        self.ball.falling = True
+        if self.physics is None:
+            self.physics = newton.gPhysics(cone=self.cone,
+                                           ball=self.ball,
+                                           ground=self.ground)
+        self.physics.update()
+
+    def run(self, duration, reference=(0, 0), interferences=None):
+        """Plays the game for duration seconds like the GAME state with a
+        steady clock and returns its results. Interferences maps tick
+        numbers to interference loads. Stops early when the simulation is
+        over or the fallen ball has stopped rolling."""
+
+        if interferences is None:
+            interferences = {}
+
+        drop_timestep = FixedTimestep(rate=100)
+        for tick in range(int(round(duration*self.timestep.rate))):
+            if not self.ball_drops:
+                state = self.tick(interferences.get(tick, 0.0), reference)
+                if not self.ball_drops:
+                    self.place(state)
+            else:
+                for _ in range(drop_timestep.advance(self.timestep.step_ms)):
+                    self.drop()
+
+            if self.simover or self.ball.stopped:
+                break
+
+        return self.get_results()
+
+    def get_results(self):
+        """Returns position, angle in degrees and time vectors up to the
+        current step, like the GAME state saves them."""
+
+        x1_vec, x2_vec, x3_vec, x4_vec = self.sim.state_vec
+        t_vec = self.sim.t_vec
+        result_vec_len = self.sim.sim_length if self.simover else self.step
+        return (x1_vec[:result_vec_len],
+                np.degrees(x3_vec[:result_vec_len]),
+                t_vec[:result_vec_len])
+
+
+if __name__ == '__main__':
+    import time
+
+    sim = Simulation(Kregs=(-1296.6, -3161.2, -31800, -9831),
+                     initial_state=(0, 0, 0, 0.3))
+    start = time.perf_counter()
+    x1, x3, t = sim.run(30, reference=(0.5, 0))
+    seconds = time.perf_counter() - start
+    print(f'Simulated {t[-1, 0]:.2f} s in {seconds*1000:.1f} ms, '
+          f'x1 = {x1[-1, 0]:.4f} m, x3 = {x3[-1, 0]:.4f}°')
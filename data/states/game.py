@@ -4,20 +4,25 @@ import pygame as pg
 import pygame.gfxdraw
 import numpy as np
 
-from .. import pg_init, pg_root, setup_sim, euler
+from .. import pg_init, pg_root, euler
+from .. simulation import Simulation
 
 from .. components import colors, tools
-from .. components import newton
+from .. components.sprites import SpriteCache, new_layer
 from .. components.mousecontrol import MouseControl
-from .. components.objects import Cone, Sphere, Ground, Ruler, Wall
+from .. components.objects import Ruler, Wall
 from .. components.animations import Impulse
+from .. components.timestep import FixedTimestep
 from .. components.rl.agent import Agent
 
 
-class Game(pg_root._State):
-    """This state represents the actual gameplay phase of the demonstrator."""
+# Cone shading is pre-rendered per 1/CONE_BUCKETS m of cone location
+CONE_BUCKETS = 40
+
 
-    step = 0
+class Game(pg_root._State):
+    """This state represents the actual gameplay phase of the demonstrator.
+    Physics are simulated by the headless Simulation core."""
 
     def __init__(self, mother=True):
         if mother:
@@ -25,28 +30,19 @@ class Game(pg_root._State):
         self.width = pg_init.SCREEN_RECT[2]
         self.height = pg_init.SCREEN_RECT[3]
         self.bg_img = pg_init.GFX['bg']
+        if mother:
+            # Sprites are kept over all games
+            self.sprites = SpriteCache()
 
         # Initialize Control Objects
         self.control_object = None
-        self.force_records = []
         self.user = MouseControl(sensibility=1000)
         self.agent = Agent()
 
-        # Initialize Dynamik Model
-        self.sim = setup_sim.SimData(120_000)
-        self.model = setup_sim.StateSpaceModel()
-
-        # Initialize Game Objects
-        self.ground = Ground(510, self.width, thickness=10)
-
-        self.cone = Cone(basis_length=pg_init.SCALE,
-                         basis_center_x=self.width//2,
-                         ratio=0.85)
-
-        self.ball = Sphere(radius=round(self.model.k_k.radius*pg_init.SCALE),
-                           mass=self.model.k_k.mass_sphere,
-                           inertia=self.model.k_k.J,
-                           zero_pos_x=self.cone.get_zero_pos())
+        # Initialize Dynamik Model and Game Objects
+        self.core = Simulation()
+        self.euler_worker = None
+        self.drop_timestep = FixedTimestep(rate=100)
 
         self.ruler = Ruler(pos=self.ground.pos+self.ground.w,
                            zero=self.cone.get_zero_pos(),
@@ -56,14 +52,17 @@ class Game(pg_root._State):
 
         self.interference_load = None
         self.wave = None
-        self.physics = None
-        self.crasher = newton.CrashHandler(self.cone)
         self.simover = False
         self.predone = False
         self.results = None
         self.state_values = (0, 0, 0, 0)
+        self.background = None
+        self._bare_background = None
+        self._wall_layer = None
+        self._drawn_rects = None
 
-        self.options = {"Hud position": 'right', "Angle unit": 'rad'}
+        self.options = {"Hud position": 'right', "Angle unit": 'rad',
+                        "Sprite cache": True}
 
     def startup(self, persistant):
         pg_root._State.startup(self, persistant)
@@ -85,15 +84,12 @@ class Game(pg_root._State):
 
         self.euler_ministeps = self.persist["euler ministeps"]
         self.limitations = self.persist["limitations"]
-        self.frame_step = self.euler_ministeps
+        # Physics tick rate, independent of the display frame rate
+        self.physics_fps = self.persist["physics fps"]
 
         self.left_wall = Wall(self.limitations[0], self.ground.pos, 3, 'left')
         self.right_wall = Wall(self.limitations[1], self.ground.pos, 3, 'right')
 
-        self.sim = setup_sim.SimData(120_000, self.sim_init_state)
-        self.model.set_Kregs(*self.Kregs)
-        self.model.update()
-
         self.ruler.marker.set(self.sim_ref_state[0])
 
         if self.mode == 'user':
@@ -107,13 +103,30 @@ class Game(pg_root._State):
             self.agent.load_model(self.agent_model)
             self.agent.observe(np.array([*self.sim_init_state, ref_x]))
             print(" -- Agent in control now -- ")
-            print("Loaded TensorFlow Keras model", self.agent_model)
+            print("Loaded model", self.agent_model)
+
+        if self.mode == 'user':
+            self.control_object = self.user
+        elif self.mode == 'agent':
+            self.control_object = self.agent
+
+        self.core = Simulation(self.Kregs, self.sim_init_state,
+                               self.limitations, self.mode,
+                               self.control_object, self.euler_ministeps,
+                               self.physics_fps)
 
         # Reset Euler algorithm
-        Game.step = 0
+        self._prev_state = np.array(self.sim_init_state[:4], dtype=float)
+        self._curr_state = self._prev_state.copy()
+        self._submitted_alpha = 0.0
+        self.euler_worker = euler.EulerWorker(target=self.core.advance)
+        self.euler_worker.start()
+
+        self.compose_background()
 
     def cleanup(self):
         self.done = False
+        self.euler_worker.stop()
         self.persist["result"] = self.results
         return self.persist
 
@@ -130,6 +143,9 @@ class Game(pg_root._State):
                     self.options["Angle unit"] = 'deg'
                 else:
                     self.options["Angle unit"] = 'rad'
+            if event.key == pg.K_F4:
+                # Compare with immediate drawing
+                self.options["Sprite cache"] = not self.options["Sprite cache"]
             if event.key == pg.K_LEFT:
                 self.ruler.marker.click(0)
             if event.key == pg.K_RIGHT:
@@ -175,116 +191,160 @@ class Game(pg_root._State):
         self.user.update(mouse)
 
     def update(self, surface):
-        if self.mode == 'user':
-            self.control_object = self.user
-        elif self.mode == 'agent':
-            self.control_object = self.agent
-
         # Update Reference State x via ruler marker
         self.ruler.marker.update()
         self.sim_ref_state = self._update_reference_state()
 
-        # Getting inferference from interfrence_load by clicking on ball
+        # Physics advances in fixed time steps by the elapsed wall-clock
+        # time, independent from the render frame rate
+        ticks = self.core.timestep.advance(self.frame_time)
+
+        # Getting inferference from interfrence_load by clicking on ball.
+        # It is kept until a frame with ticks can apply it.
         interference = 0.0
-        if self.interference_load is not None:
+        if self.interference_load is not None and ticks > 0:
             interference = self.interference_load
             self.interference_load = None
 
-        self.euler_thread = euler.EulerThread(
-            args=(self.model.system, self.model.B, self.sim.state_vec,
-                  self.sim.t_vec, self.static_fps, self.euler_ministeps,
-                  Game.step, self.control_object, interference,
-                  self.sim_ref_state, self.crasher)
-        )
-        self.euler_thread.start()
-        x1, x2, x3, x4, self.simover = self.euler_thread.join()
+        # Ticks were requested while the last frame was drawn, except on
+        # the first frame
+        if self.euler_worker.pending:
+            states, self.simover, falling = self.euler_worker.collect()
+        else:
+            states, falling = [], self.core.ball_drops
 
-        if self.mode == 'agent':
-            ref_x = np.array([self.sim_ref_state[0]])
-            self.agent.observe(np.array([x1, x2, x3, x4, ref_x]))
-
-        # Location limit check
-        x_max = (self.width//2) / pg_init.SCALE
-        cone_len = self.cone.size / pg_init.SCALE
-        x_limit_left = x_max - self.limitations[0] - cone_len/2
-        x_limit_right = x_max - self.limitations[1] - cone_len/2
-        if (x1 < -x_limit_left) or (x1 > x_limit_right):
-            # If cone touches wall, cone will stop
-            self.crasher.crashed = True
-            self.model.set_Kregs(0, 0, 0, 0)
-            self.model.update()
-
-        # Ball tilting check
-        if abs(x3) > m.radians(20):
-            # If ball tilt angle > 20°
-            # System stops controlling, controller values set to zero
-            self.model.set_Kregs(0, 0, 0, 0)
-            self.model.update()
-
-        if abs(x3) > m.radians(60):
-            # If ball tilt angle > 60°
-            # Ball will start falling and shall roll down the cone
-            self.ball.falling = True
+        if states:
+            self._prev_state = states[-2] if len(states) > 1 \
+                else self._curr_state
+            self._curr_state = states[-1]
+        x1, x2, x3, x4 = self._curr_state
 
         # Update state_values for HUD
-        self.state_values = (np.float(x1), np.float(x2),
-                             np.float(x3), np.float(x4))
+        self.state_values = (float(x1), float(x2), float(x3), float(x4))
 
         # If-Path for Euler Method
-        if not self.ball.falling:
-            if self.mode == 'agent':
-                self.agent.update()
-            self.cone.update(np.float(x1))
-            self.ball.update(self.cone.get_points('top'),
-                             np.float(x3), np.float(x4))
-
-            if not self.simover:
-                Game.step += self.frame_step
-
-            if self.control_object is not None:
-                self.force_records.append(self.control_object.force)
+        if not falling:
+            # Rendering interpolates between the last two physics ticks by
+            # the time left over when they were submitted
+            alpha = self._submitted_alpha
+            self.core.place(self._prev_state
+                            + alpha*(self._curr_state - self._prev_state))
 
         # Else-Path for simulating ball drop
         else:
-            if self.physics is None:
-                self.physics = newton.gPhysics(cone=self.cone,
-                                               ball=self.ball,
-                                               ground=self.ground)
-            self.physics.update()
+            for _ in range(self.drop_timestep.advance(self.frame_time)):
+                self.core.drop()
+
+        # Next ticks are calculated by the Euler worker while this frame is
+        # drawn. It gets the inputs as they are now.
+        if not self.predone:
+            self.submit_ticks(ticks, interference)
 
         # When event key [ESC]
         # Before state is going to close it will save the results
         if self.predone:
-            x1_vec, x2_vec, x3_vec, x4_vec = self.sim.state_vec
-            t_vec = self.sim.t_vec
-            result_vec_len = self.sim.sim_length if self.simover else Game.step
-            self.results = (x1_vec[:result_vec_len],
-                            np.degrees(x3_vec[:result_vec_len]),
-                            t_vec[:result_vec_len])
+            self.results = self.core.get_results()
             self.done = True
 
         self.draw(surface)
 
+    def submit_ticks(self, ticks, interference):
+        """Requests a number of physics ticks from the Euler worker. Model,
+        crash handler, agent and simulation data of the core must not be
+        changed until its result is collected."""
+
+        self._submitted_alpha = self.core.timestep.alpha
+
+        # Mouse force is sampled now, agent acts on every tick by itself
+        force = None
+        if self.mode == 'user':
+            force = self.user.force
+
+        self.euler_worker.submit(ticks, interference, self.sim_ref_state,
+                                 force)
+
+    def compose_background(self):
+        """Draws the static scene once into the background layer."""
+
+        self.background = self.bg_img.copy()
+        self.draw_ground(self.background)
+        self.draw_ruler(self.background)
+        # Scene under the walls for objects, which move into their zones
+        self._bare_background = self.background.copy()
+        self._wall_layer = None
+        if self.mode is not 'user':
+            self.draw_walls(self.background)
+        self._drawn_rects = None
+
     def draw(self, surface):
-        surface.blit(self.bg_img, pg_init.SCREEN_RECT)
-        self.draw_ground(surface)
-        self.draw_ruler(surface)
-        self.draw_cone(surface, reflection=True)
-        self.draw_ball(surface)
+        # Only the regions of moving objects are restored from the
+        # background and updated on the display
+        if self._drawn_rects is None:
+            surface.blit(self.background, pg_init.SCREEN_RECT)
+        else:
+            for rect in self._drawn_rects:
+                surface.blit(self.background, rect, rect)
+
+        rects = self.draw_scene(surface)
         if self.mode is not 'user':
-            self.draw_walls(surface)
-        self.draw_hud(surface, 115, 66, pos=self.options["Hud position"])
+            self.draw_under_walls(surface, rects)
+        rects.append(self.draw_hud(surface, 115, 66,
+                                   pos=self.options["Hud position"]))
         if self.control_object is not None:
-            self.draw_force_hud(surface, 160, 36)
+            rects.append(self.draw_force_hud(surface, 160, 36))
 
         if self.wave is not None and not (self.ball.falling or self.simover):
-            self.draw_impulsewave(surface)
+            rects.append(self.draw_impulsewave(surface))
 
         if self.ball.touchdown:
-            self.draw_message(surface, 'Game Over')
+            rects.append(self.draw_message(surface, 'Game Over'))
 
         if self.simover:
-            self.draw_message(surface, 'Finished')
+            rects.append(self.draw_message(surface, 'Finished'))
+
+        rects = [rect for rect in rects if rect is not None]
+        if self._drawn_rects is None:
+            self.dirty_rects = [pg_init.SCREEN_RECT]
+        else:
+            self.dirty_rects = self._drawn_rects + rects
+        self._drawn_rects = rects
+
+    def draw_scene(self, surface):
+        """Draws the moving objects below the walls and returns their
+        rects."""
+
+        rects = [self.draw_trigon_marker(surface)]
+        if self.mode is not 'user':
+            rects.append(self.draw_reference_marker(surface))
+        rects.append(self.draw_cone(surface, reflection=True))
+        rects.append(self.draw_ball(surface))
+        return rects
+
+    def draw_under_walls(self, surface, rects):
+        """Redraws the parts of the scene in the wall zones from the bare
+        background, so the walls stay on top of the cone and ball."""
+
+        zones = []
+        for wall in [self.left_wall, self.right_wall]:
+            zone = pg.Rect(wall.get_zone())
+            zone.normalize()
+            zones.append(zone.union(wall.rect))
+
+        overlaps = [zone.clip(rect) for rect in rects for zone in zones]
+        overlaps = [rect for rect in overlaps if rect.w and rect.h]
+        if not overlaps:
+            return
+
+        # Drawn unclipped on a scratch layer, clipping shifts the
+        # antialiased outlines
+        if self._wall_layer is None:
+            self._wall_layer = self._bare_background.copy()
+        for rect in overlaps:
+            self._wall_layer.blit(self._bare_background, rect, rect)
+        self.draw_scene(self._wall_layer)
+        self.draw_walls(self._wall_layer)
+        for rect in overlaps:
+            surface.blit(self._wall_layer, rect, rect)
 
     def draw_walls(self, surface):
         for wall in [self.left_wall, self.right_wall]:
@@ -296,8 +356,6 @@ class Game(pg_root._State):
                      *self.ground.get_line(), self.ground.w)
 
     def draw_ruler(self, surface):
-        self.draw_trigon_marker(surface)
-
         for scale in self.ruler.scales:
             pg.draw.line(surface, colors.BLACK, *scale, self.ruler.scale_w)
 
@@ -306,9 +364,6 @@ class Game(pg_root._State):
                              colors.BLACK, center=(label.pos[0], label.pos[1]))
             surface.blit(label.font_cache[0], label.font_cache[1])
 
-        if self.mode is not 'user':
-            self.draw_reference_marker(surface)
-
     def draw_trigon_marker(self, surface):
         point_bottom = (self.cone.get_points('top')[0],
                         self.ground.pos + self.ground.w)
@@ -317,9 +372,9 @@ class Game(pg_root._State):
         point_right = (self.cone.get_points('top')[0] + (self.ground.w//2),
                        self.ground.pos+1)
 
-        tools.draw_aafilled_polygon(surface,
-                                    (point_bottom, point_left, point_right),
-                                    colors.GREY)
+        return tools.draw_aafilled_polygon(
+            surface, (point_bottom, point_left, point_right), colors.GREY
+        )
 
     def draw_reference_marker(self, surface):
         # Draws a pentagon like a house shape (trigon + rectangle)
@@ -329,49 +384,90 @@ class Game(pg_root._State):
         point_b = marker.rec_x + marker.width, marker.rec_y
         point_c = marker.rec_x, marker.rec_y + marker.length
         point_d = marker.rec_x + marker.width, marker.rec_y + marker.length
-        tools.draw_aafilled_polygon(surface, (point_top, point_a, point_c,
-                                              point_d, point_b), marker.color)
+        rect = tools.draw_aafilled_polygon(surface, (point_top, point_a,
+                                                     point_c, point_d,
+                                                     point_b), marker.color)
         # Draw shadow
-        pg.draw.aalines(surface, colors.ORANGE_PACK['shadow'], False,
-                        (point_top, point_b, point_d))
+        return rect.union(pg.draw.aalines(surface,
+                                          colors.ORANGE_PACK['shadow'], False,
+                                          (point_top, point_b, point_d)))
 
     def draw_cone(self, surface, reflection=True):
-        # Real location of cone
-        _x_ = self.cone.loc
-
         # Antialiased outline
         pg.gfxdraw.aatrigon(surface, *self.cone.get_coords(), colors.GREY)
+        rect = tools.bounding_rect(self.cone.get_points())
 
         if not reflection:
             pg.draw.polygon(surface, colors.GREY, self.cone.get_points())
+        elif self.options["Sprite cache"]:
+            bucket = round(self.cone.loc*CONE_BUCKETS)
+            anchor = (int(self.cone.get_points('left')[0]),
+                      int(self.cone.get_points('top')[1]))
+            self.sprites.blit(surface, ('cone', bucket),
+                              lambda: self._render_cone(bucket/CONE_BUCKETS),
+                              anchor)
         else:
-            for s in range(40):
-                grey = 100
-                grey = grey * m.sin(m.pi*((s + _x_*4)/40))**3 + 75
-                if grey < 0:
-                    grey = 0
-
-                rgb = (grey, grey, grey)
-                pg.draw.polygon(surface, rgb,
-                                ((self.cone.get_points('left')[0] + s*5,
-                                  self.cone.get_points('left')[1]),
-                                 self.cone.get_points('right'),
-                                 self.cone.get_points('top')))
+            # Real location of cone
+            self._draw_cone_shading(surface, self.cone.loc,
+                                    self.cone.get_points())
+        return rect
 
     def draw_ball(self, surface):
-        # Real location of ball
-        _x_ = self.ball.loc
-
         # Antialiased outline
-        pg.gfxdraw.aacircle(surface, *self.ball.get_center(),
-                            self.ball.r, colors.DRED)
+        c_x, c_y = self.ball.get_center()
+        r = self.ball.r
+        pg.gfxdraw.aacircle(surface, c_x, c_y, r, colors.DRED)
+        rect = pg.Rect(c_x - r - 1, c_y - r - 1, 2*r + 3, 2*r + 3)
+
+        # Shading, lightest spot moves with the real location of ball
+        apex_y = self.cone.get_points('top')[1]
+        light_x = round(-10*self.ball.loc)
+        if self.options["Sprite cache"]:
+            rect.union_ip(self.sprites.blit(
+                surface, ('ball', light_x, c_y, apex_y, r),
+                lambda: self._render_ball(c_x, c_y, light_x, apex_y),
+                (c_x, c_y)
+            ))
+        else:
+            for x, y, r_x, r_y, rgb in self._ball_shades(c_x, c_y, light_x,
+                                                         apex_y):
+                pg.gfxdraw.filled_ellipse(surface, x, y, r_x, r_y, rgb)
+                rect.union_ip((x - abs(r_x), y - abs(r_y),
+                               2*abs(r_x) + 1, 2*abs(r_y) + 1))
+
+        # pg.draw.line(surface, color.DGREY, *self.ball.get_equator_line(10)
+        return rect.union(tools.draw_aafilled_polygon(
+            surface, self.ball.get_equator_tape(width=10), colors.DGREY
+        ))
+
+    def _draw_cone_shading(self, surface, _x_, points):
+        left, right, top = points
+        for s in range(40):
+            grey = 100
+            grey = grey * m.sin(m.pi*((s + _x_*4)/40))**3 + 75
+            if grey < 0:
+                grey = 0
+
+            rgb = (grey, grey, grey)
+            pg.draw.polygon(surface, rgb,
+                            ((left[0] + s*5, left[1]), right, top))
+
+    def _render_cone(self, _x_):
+        width = self.cone.size
+        height = int(self.cone.height)
+        layer = new_layer(width + 1, height + 1)
+        self._draw_cone_shading(layer, _x_, ((0, height), (width, height),
+                                             (width/2, 0)))
+        return layer, (0, 0)
+
+    def _ball_shades(self, c_x, c_y, light_x, apex_y):
+        """Returns the shading ellipses of the ball as center, radii and
+        color."""
 
-        # Shading
         shades = 21
+        ellipses = []
         for s in range(shades):
             r_y = self.ball.r
-            c_x, c_y = self.ball.get_center()
-            apex_y = self.cone.get_points('top')[1]
             red = colors.DRED[0]
             red = red + 5*s
             rgb = (red, 0, 0)
@@ -380,13 +476,12 @@ class Game(pg_root._State):
             w = 3
 
             if s == 0:
-                pg.gfxdraw.filled_ellipse(surface, c_x, c_y,
-                                          self.ball.r - w*s, r_y - w*s, rgb)
+                ellipses.append((c_x, c_y, self.ball.r - w*s, r_y - w*s, rgb))
 
             else:
                 offzero = apex_y - c_y - self.ball.r
                 change = m.sqrt(1.26*((abs(offzero)/200) + 1))
-                lightest_spot_c_x = c_x + round(-10*_x_)
+                lightest_spot_c_x = c_x + light_x
                 lightest_spot_c_y = round(change*(apex_y - self.ball.r))
                 light_offcenter_y = abs(lightest_spot_c_y - c_y)
 
@@ -400,31 +495,40 @@ class Game(pg_root._State):
 
                 gap_x = (lightest_spot_c_x-c_x) / (shades-2)
                 gap_y = (lightest_spot_c_y-c_y) / (shades-2)
-                pg.gfxdraw.filled_ellipse(surface,
-                                          c_x + round(gap_x*s),
-                                          c_y + round(gap_y*s),
-                                          self.ball.r - w*s,
-                                          r_y - w*s - sqz_y,
-                                          rgb)
-
-        # pg.draw.line(surface, color.DGREY, *self.ball.get_equator_line(10)
-        tools.draw_aafilled_polygon(surface,
-                                    self.ball.get_equator_tape(width=10),
-                                    colors.DGREY)
+                ellipses.append((c_x + round(gap_x*s),
+                                 c_y + round(gap_y*s),
+                                 self.ball.r - w*s,
+                                 r_y - w*s - sqz_y,
+                                 rgb))
+        return ellipses
+
+    def _render_ball(self, c_x, c_y, light_x, apex_y):
+        ellipses = self._ball_shades(c_x, c_y, light_x, apex_y)
+        left = min(x - abs(r_x) for x, _, r_x, _, _ in ellipses)
+        top = min(y - abs(r_y) for _, y, _, r_y, _ in ellipses)
+        right = max(x + abs(r_x) for x, _, r_x, _, _ in ellipses)
+        bottom = max(y + abs(r_y) for _, y, _, r_y, _ in ellipses)
+
+        layer = new_layer(right - left + 1, bottom - top + 1)
+        for x, y, r_x, r_y, rgb in ellipses:
+            pg.gfxdraw.filled_ellipse(layer, x - left, y - top, r_x, r_y, rgb)
+        return layer, (left - c_x, top - c_y)
 
     def draw_impulsewave(self, surface):
         if self.wave.running:
-            alpha_surface = pg.Surface((self.width, self.height), pg.SRCALPHA)
-            pg.draw.circle(alpha_surface, self.wave.dynamic_color,
-                           self.wave.get_center(), self.wave.radius,
-                           self.wave.width)
-            surface.blit(alpha_surface, (0, 0))
+            layer = pg_root.overlays.layer('impulse wave',
+                                           (self.width, self.height))
+            rect = pg.draw.circle(layer, self.wave.dynamic_color,
+                                  self.wave.get_center(), self.wave.radius,
+                                  self.wave.width)
+            pg_root.overlays.use('impulse wave', rect)
+            return surface.blit(layer, rect, rect)
 
     def draw_hud(self, surface, width, height, margin=4, pos='right'):
         text_margin = 5
         line_margin = 14
 
-        rect = self.render_hud(width, height, margin, pos)
+        rect = pg.Rect(self.render_hud(width, height, margin, pos))
         pg.gfxdraw.box(surface, rect, colors.TRAN200)
 
         units = ['m', 'm/s', 'rad', 'rad/s']
@@ -442,6 +546,7 @@ class Game(pg_root._State):
             surface.blit(text,
                          (rect[0] + text_margin,
                           rect[1] + text_margin + num*line_margin))
+        return rect
 
     def draw_force_hud(self, surface, width, height,
                        update_rate=10, margin=4, pos='center'):
@@ -450,7 +555,7 @@ class Game(pg_root._State):
         text_margin_top = 4
         text_margin_left = 8
 
-        rect = self.render_hud(width, height, margin, pos)
+        rect = pg.Rect(self.render_hud(width, height, margin, pos))
         pg.gfxdraw.box(surface, rect, colors.TRAN200)
 
         fontname = 'Consolas'
@@ -465,18 +570,42 @@ class Game(pg_root._State):
         text = self.render_font(value_str, fontname, fontsize, text_color)
         surface.blit(text, (rect[0]+text_margin_left, rect[1]+text_margin_top))
         self.run_loop_counter()
+        return rect
 
     def draw_message(self, surface, text):
-        fontname = 'ARCADECLASSIC'
         center = (self.width//2, self.cone.get_points('top')[1]//2)
-        msg, rect = self.render_font(text, fontname, 128, colors.LRED, center)
+        message, offset = pg_root.overlays.static(
+            ('message', text), lambda: self._render_message(text)
+        )
+        return surface.blit(message, (center[0] + offset[0],
+                                      center[1] + offset[1]))
+
+    def _render_message(self, text):
+        fontname = 'ARCADECLASSIC'
+        msg, rect = self.render_font(text, fontname, 128, colors.LRED, (0, 0))
         alpha_surface = pg.Surface((rect[2]+12, rect[3]-10), pg.SRCALPHA)
         alpha_surface.fill(colors.TRAN150)
         alpha_surface.blit(msg, (8, -3))
-        surface.blit(alpha_surface, rect)
+        return alpha_surface, rect.topleft
 
     def _disturbing_func(self, intensity):
         return -intensity*1.0e-2
 
     def _update_reference_state(self):
         return self.ruler.marker.value, self.sim_ref_state[1]
+
+    @property
+    def cone(self):
+        return self.core.cone
+
+    @property
+    def ball(self):
+        return self.core.ball
+
+    @property
+    def ground(self):
+        return self.core.ground
+
+    @property
+    def sim(self):
+        return self.core.sim
@@ -2,6 +2,7 @@ import math as m
 
 import pygame as pg
 import pygame.gfxdraw
+import numpy as np
 import matplotlib.pyplot as plt
 
 from .. import pg_init, pg_root, setup_sim
@@ -29,8 +30,9 @@ class PoleMap(pg_root._State):
 
         # Initialize sliders
         self.sliders = []
-        slider_ranges = [(0, -10000), (0, -20000), (0, -180000), (0, -60000)]
-        for r in slider_ranges:
+        self.slider_ranges = [(0, -10000), (0, -20000),
+                              (0, -180000), (0, -60000)]
+        for r in self.slider_ranges:
             self.sliders.append(slider.Slider(r, 2, 200, colors.CORAL_PACK))
         # # Group up sliders
         self.sliders[-1].group((20, 20), header_text='Controller Settings',
@@ -59,6 +61,19 @@ class PoleMap(pg_root._State):
 
         self.options = {"Hud position": 'left'}
 
+        # Stability heatmap over two gains, the others as set by sliders
+        self.show_heatmap = False
+        self.heatmap = None
+        self.heatmap_pairs = [(2, 3), (0, 1), (0, 2), (1, 3)]
+        self.heatmap_pair = 0
+        self._heatmap_key = None
+
+        # Gains designed by dragging poles, until a slider is grabbed.
+        # The grabbed pole is followed by its location, as the order of
+        # eigenvalues can change with the gains.
+        self.design_Kregs = None
+        self.grabbed_pole = None
+
         self.polemap_imagestr = ''
 
     def startup(self, persistant):
@@ -107,6 +122,11 @@ class PoleMap(pg_root._State):
                 self.options["Hud position"] = 'left'
             if event.key == pg.K_F2:
                 self.options["Hud position"] = 'right'
+            if event.key == pg.K_F3:
+                self.show_heatmap = not self.show_heatmap
+            if event.key == pg.K_F4:
+                self.heatmap_pair = ((self.heatmap_pair + 1)
+                                     % len(self.heatmap_pairs))
             if event.key == pg.K_KP_PLUS:
                 self.plane.Re_axis.zoom()
                 self.plane.Im_axis.zoom()
@@ -114,6 +134,48 @@ class PoleMap(pg_root._State):
                 self.plane.Re_axis.zoom(dir='out')
                 self.plane.Im_axis.zoom(dir='out')
 
+        if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            if not self.checkbox.checked:
+                for pole in self.poles or []:
+                    if pole.mouse_inside(event.pos):
+                        pole.pickup()
+                        self.grabbed_pole = complex(pole.Re, pole.Im)
+                        break
+
+        if event.type == pg.MOUSEBUTTONUP and event.button == 1:
+            self.grabbed_pole = None
+
+    def mouse_logic(self, mouse):
+        if self.grabbed_pole is not None:
+            self.drag_pole(mouse)
+
+    def drag_pole(self, mouse):
+        """Moves the grabbed pole to the mouse and solves the gains which
+        place the poles there. Complex poles take their conjugate along,
+        real poles stay on the real axis."""
+
+        poles = self.model.get_poles().copy()
+        num = np.argmin(np.abs(poles - self.grabbed_pole))
+        pole = poles[num]
+        Re, Im = self.plane.get_point(mouse)
+
+        if pole.imag != 0:
+            partner = np.argmin(np.abs(poles - pole.conjugate())
+                                + (np.arange(len(poles)) == num))
+            new_pole = complex(Re, m.copysign(max(abs(Im), 1e-3), pole.imag))
+            poles[partner] = new_pole.conjugate()
+        else:
+            new_pole = complex(Re, 0)
+        poles[num] = new_pole
+        self.grabbed_pole = new_pole
+
+        self.design_Kregs = list(self.model.place(poles))
+
+        # Sliders only show the designed gains within their ranges
+        for slider_, value, range_ in zip(self.sliders, self.design_Kregs,
+                                          self.slider_ranges):
+            slider_.set(min(max(value, min(range_)), max(range_)))
+
     def update(self, surface):
         if self.checkbox.checked:
             self.Kregs = [0, 0, 0, 0]
@@ -122,7 +184,12 @@ class PoleMap(pg_root._State):
         else:
             for sldr in self.sliders:
                 sldr.active = True
-            self.Kregs = slider.Slider.groups[1].get_values()
+            if any(sldr.thumb.grabbed for sldr in self.sliders):
+                self.design_Kregs = None
+            if self.design_Kregs is not None:
+                self.Kregs = self.design_Kregs
+            else:
+                self.Kregs = slider.Slider.groups[1].get_values()
 
         self.model.set_Kregs(*self.Kregs)
         self.model.update()
@@ -132,15 +199,16 @@ class PoleMap(pg_root._State):
             pos = self.plane.get_pos_from_point((pole.real, pole.imag))
             self.poles.append(gaussian.Pole(pos, 15, pole.real, pole.imag))
 
+        if self.show_heatmap:
+            self.update_heatmap()
+
         if self.but_set.pressed:
             self.save_screen(surface)
 
         self.draw(surface)
 
     def draw(self, surface):
-        surface.fill(colors.WHITE)
-        self.draw_coordlines(surface, self.plane.Re_axis, self.plane.Im_axis)
-        self.draw_axes(surface, self.plane.Re_axis, self.plane.Im_axis)
+        surface.blit(self.plane.get_layer(self.draw_plane), (0, 0))
 
         # Animate unstable pole flicker via signal
         signal_length = self.static_fps // 2
@@ -169,6 +237,59 @@ class PoleMap(pg_root._State):
         self.draw_interface(surface)
         self.draw_hud(surface, 115, 66, pos=self.options["Hud position"])
 
+        if self.show_heatmap:
+            self.draw_heatmap(surface)
+
+    def update_heatmap(self, resolution=100, size=200):
+        """Renders the stability margin over the slider ranges of the
+        selected gain pair. Only recomputed when the other gains change."""
+
+        i, j = self.heatmap_pairs[self.heatmap_pair]
+        others = tuple(k for num, k in enumerate(self.Kregs)
+                       if num not in (i, j))
+        key = i, j, others
+        if key == self._heatmap_key:
+            return
+        self._heatmap_key = key
+
+        axes = [[k] for k in self.Kregs]
+        axes[i] = np.linspace(*self.slider_ranges[i], resolution)
+        axes[j] = np.linspace(*self.slider_ranges[j], resolution)
+        margin, _, _ = self.model.stability_map(setup_sim.gain_grid(*axes))
+        margin = margin.reshape(resolution, resolution)
+
+        # Green when stable and red when unstable, brighter with margin
+        intensity = 80 + 175*np.tanh(np.abs(margin) / 5)
+        rgb = np.zeros((resolution, resolution, 3))
+        rgb[..., 0] = np.where(margin > 0, 0, intensity)
+        rgb[..., 1] = np.where(margin > 0, intensity, 0)
+        # Surface y-axis points downwards
+        heatmap = pg.surfarray.make_surface(rgb[:, ::-1].astype(np.uint8))
+        self.heatmap = pg.transform.scale(heatmap, (size, size))
+
+    def draw_heatmap(self, surface, margin=15, top=60):
+        rect = self.heatmap.get_rect(topright=(self.width-margin, top))
+        surface.blit(self.heatmap, rect)
+        pg.draw.rect(surface, colors.BLACK, rect, 1)
+
+        # Marker of the current gains
+        i, j = self.heatmap_pairs[self.heatmap_pair]
+        (start_i, end_i), (start_j, end_j) = (self.slider_ranges[i],
+                                              self.slider_ranges[j])
+        pos_x = rect.left + (self.Kregs[i]-start_i) / (end_i-start_i)*rect.w
+        pos_y = rect.bottom - (self.Kregs[j]-start_j) / (end_j-start_j)*rect.h
+        pg.draw.circle(surface, colors.WHITE, (round(pos_x), round(pos_y)), 4,
+                       1)
+
+        text = self.hudfont.render(f'x: k{i+1}  y: k{j+1}  [F4]', True,
+                                   colors.BLACK)
+        surface.blit(text, (rect.left, rect.bottom + 4))
+
+    def draw_plane(self, surface):
+        surface.fill(colors.WHITE)
+        self.draw_coordlines(surface, self.plane.Re_axis, self.plane.Im_axis)
+        self.draw_axes(surface, self.plane.Re_axis, self.plane.Im_axis)
+
     def draw_axes(self, surface, axis_1, axis_2):
         d = {0: axis_1, 1: axis_2}
         for axis in range(2):
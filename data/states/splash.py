@@ -17,6 +17,7 @@ class Splash(pg_root._State):
 
         self.game_fps_bins = [False, True]
         self.euler_ministeps = 10
+        self.physics_fps = pg_init.PHYSICS_FPS
 
         # Initialize splash menu mode buttons
         margin = 50
@@ -46,11 +47,13 @@ class Splash(pg_root._State):
         pg_root._State.startup(self, persistant)
         self.game_fps_bins = self.persist["game fps binaries"]
         self.euler_ministeps = self.persist["euler ministeps"]
+        self.physics_fps = self.persist["physics fps"]
 
     def cleanup(self):
         self.done = False
         self.persist["game fps binaries"] = self.game_fps_bins
         self.persist["euler ministeps"] = self.euler_ministeps
+        self.persist["physics fps"] = self.physics_fps
         self.persist["bg_image"] = self.screenshot
         return self.persist
 
@@ -74,11 +77,18 @@ class Splash(pg_root._State):
         Button.multidraw(surface, self.but_csd, self.but_rl, self.but_set)
 
     def draw_header(self, surface, text):
-        fontname = 'ARCADECLASSIC'
         center = (self.width//2-42, 85)
-        msg, rect = self.render_font(text, fontname, 128, colors.TOMATO, center)
+        header, offset = pg_root.overlays.static(
+            ('header', text), lambda: self._render_header(text)
+        )
+        surface.blit(header, (center[0] + offset[0], center[1] + offset[1]))
+
+    def _render_header(self, text):
+        fontname = 'ARCADECLASSIC'
+        msg, rect = self.render_font(text, fontname, 128, colors.TOMATO,
+                                     (0, 0))
         pos_x, pos_y, width, height = rect
         alpha_surface = pg.Surface((width+84, height-10), pg.SRCALPHA)
         alpha_surface.fill(colors.TRAN150)
         alpha_surface.blit(msg, (42, -3))
-        surface.blit(alpha_surface, (pos_x, pos_y, width, height))
+        return alpha_surface, (pos_x, pos_y)
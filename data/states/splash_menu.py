@@ -33,6 +33,7 @@ class MainSetup(pg_root._State):
         pg_root._State.startup(self, persistant)
         self.game_fps_bins = self.persist["game fps binaries"]
         self.euler_ministeps = self.persist["euler ministeps"]
+        self.physics_fps = self.persist["physics fps"]
 
         # Initialize checkboxes for choosing fps
         self.fps_cboxes = []
@@ -57,12 +58,24 @@ class MainSetup(pg_root._State):
                           header_text='Euler steps per frame', header_size=26)
         self.slider.set(self.euler_ministeps)
 
+        # Initialize slider for physics tick rate, independent of frame rate
+        self.rate_slider = slider.Slider((50, 500), 4, 250, colors.GREEN_PACK,
+                                         margin=15, unit='Hz',
+                                         default=pg_init.PHYSICS_FPS)
+        self.rate_slider.settings['integer'] = True
+        self.rate_slider.group((self.win.con_pos[0]+10,
+                                self.win.con_pos[1]+325),
+                               header_text='Physics ticks per second',
+                               header_size=26)
+        self.rate_slider.set(self.physics_fps)
+
         self.bg_img = self.persist["bg_image"]
 
     def cleanup(self):
         self.done = False
         self.persist["game fps binaries"] = self.game_fps_bins
         self.persist["euler ministeps"] = self.euler_ministeps
+        self.persist["physics fps"] = self.physics_fps
         return self.persist
 
     def get_event(self, event):
@@ -82,6 +95,7 @@ class MainSetup(pg_root._State):
     def draw_interface(self, surface):
         checkbox.CheckBox.groups[1].draw(surface)
         slider.Slider.groups[1].draw(surface)
+        slider.Slider.groups[2].draw(surface)
         self.but_ok.draw(surface)
 
     def draw_heading(self, surface):
@@ -90,6 +104,7 @@ class MainSetup(pg_root._State):
     def _save_settings(self):
         self.game_fps_bins = checkbox.CheckBox.groups[1].get_bools()
         self.euler_ministeps = slider.Slider.groups[1].get_values()[0]
+        self.physics_fps = slider.Slider.groups[2].get_values()[0]
 
     def _state_in_rad(self, state):
         for num, value in enumerate(state):
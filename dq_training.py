@@ -1,13 +1,13 @@
 import os
 import json
 
-import tensorflow as tf
 from tensorflow import keras
 # from tensorflow.keras import backend as K
 import gym
 
 from data.components.rl import environment as env
-from data.components.rl.dq_util import *
+from data.components.rl.dq_trainer import DQNTrainer
+from data.components.rl.replay import ReplayMemory, PrioritizedReplayMemory
 
 
 # Just disables the warning, doesn't enable AVX/FMA
@@ -23,68 +23,50 @@ model = keras.models.Sequential([
     keras.layers.Dense(n_outputs),
 ])
 
-env = env.Environment(adv_reward=False)
-obs = env.reset()
-
-# env = gym.make("CartPole-v0")
-# obs = env.reset()
-
 batch_size = 128
 discount_factor = 0.99
 n_max_steps = 200
 ep_trainbegin = 200
 max_eps = 1000
 
-optimizer = keras.optimizers.Adam(lr=1e-3)
-loss_fn = keras.losses.mean_squared_error
+# Gradient steps per environment step and target network updates, a hard
+# copy every target_update gradient steps or Polyak averaging with tau
+train_steps = 1
+target_update = 1000
+tau = None
 
+# Prioritized experience replay, beta anneals to 1 until max_eps
+prioritized_replay = False
+beta_start = 0.4
 
-def training_step(batch_size):
-    experiences = sample_experiences(batch_size)
-    states, actions, rewards, next_states, dones = experiences
-    next_Q_values = model.predict(next_states)
-    max_next_Q_values = np.max(next_Q_values, axis=1)
-    target_Q_values = (rewards
-                       + (1 - dones)*discount_factor*max_next_Q_values)
-    target_Q_values = target_Q_values.reshape(-1, 1)
-    mask = tf.one_hot(actions, n_outputs)
-    with tf.GradientTape() as tape:
-        all_Q_values = model(states)
-        Q_values = tf.reduce_sum(all_Q_values*mask, axis=1, keepdims=True)
-        loss = tf.reduce_mean(loss_fn(target_Q_values, Q_values))
-    grads = tape.gradient(loss, model.trainable_variables)
-    optimizer.apply_gradients(zip(grads, model.trainable_variables))
+env = env.Environment(adv_reward=False, n_max_steps=n_max_steps)
+obs = env.reset()
+
+if prioritized_replay:
+    replay_memory = PrioritizedReplayMemory(2000, input_shape[0],
+                                            beta=beta_start)
+else:
+    replay_memory = ReplayMemory(2000, input_shape[0])
 
+# env = gym.make("CartPole-v0")
+# obs = env.reset()
+
+optimizer = keras.optimizers.Adam(lr=1e-3)
+loss_fn = keras.losses.mean_squared_error
 
 # env.seed(42)
 # np.random.seed(42)
 # tf.random.set_seed(42)
 
-episode_reward_progress = []
-best_score = 0
-for episode in range(max_eps):
-    # new_lr = (1 - episode/500, 0.0001)
-    # K.set_value(model.optimizer.learning_rate, new_lr)
-    obs = env.reset()
-
-    episode_rewards = []
-    for step in range(n_max_steps):
-        epsilon = 1 if episode < 200 else max(epsilon*0.9997, 0.01)
-        obs, reward, done = play_one_step(env, obs, model, epsilon, gym=False)
-        episode_rewards.append(reward)
-        if done:
-            break
-
-    episode_total_reward = round(np.float(sum(episode_rewards)), 2)
-    episode_reward_progress.append(episode_total_reward)
-    if episode_total_reward > best_score:
-        best_weights = model.get_weights()
-        best_score = episode_total_reward
-    print(f'done episode {episode+1} of {max_eps} e={epsilon}'
-          + f'- r[{episode_total_reward}]({best_score})')
-
-    if episode > ep_trainbegin:
-        training_step(batch_size)
+trainer = DQNTrainer(model, env, replay_memory, optimizer, loss_fn,
+                     n_outputs=n_outputs, batch_size=batch_size,
+                     discount_factor=discount_factor,
+                     n_max_steps=n_max_steps, train_begin=ep_trainbegin,
+                     train_steps=train_steps, target_update=target_update,
+                     tau=tau, beta_start=beta_start, gym=False)
+episode_reward_progress = trainer.train(max_eps)
+best_weights = trainer.best_weights
+best_score = trainer.best_score
 
 jsondumb = episode_reward_progress
 
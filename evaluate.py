@@ -0,0 +1,106 @@
+import os
+import argparse
+import time
+
+from data.components.rl import evaluation
+
+
+def argparser():
+    parser = argparse.ArgumentParser(
+        description="############# Policy Evaluation #############"
+    )
+
+    parser.add_argument("-k", "--kregs", nargs=4, metavar="",
+                        help="evaluate the state space controller with \
+                                gains k1 k2 k3 k4",
+                        type=float)
+
+    parser.add_argument("-m", "--model", metavar="",
+                        help="evaluate a trained model from \
+                                data/components/rl/models or a path",
+                        type=str)
+
+    parser.add_argument("-e", "--episodes", metavar="",
+                        help="number of evaluated episodes, default: 1000",
+                        type=int, default=1000)
+
+    parser.add_argument("-l", "--episode_length", metavar="",
+                        help="length of episode, default: 200",
+                        type=int, default=200)
+
+    parser.add_argument("-w", "--hold_steps", metavar="",
+                        help="steps an episode must stay in the settling \
+                                band at its end to count as settled, \
+                                default: 50",
+                        type=int, default=evaluation.HOLD_STEPS)
+
+    parser.add_argument("-v", "--variance", metavar="",
+                        help="variance of initial state, default: 0 (low) \
+                                options: 1 (med) and 2 (high)",
+                        type=int, default=0)
+
+    parser.add_argument("-a", "--adv_reward",
+                        help="use environment with advanced reward function",
+                        action="store_true")
+
+    parser.add_argument("-r", "--reference",
+                        help="use random reference positions for the \
+                                controller, models use it by their inputs",
+                        action="store_true")
+
+    parser.add_argument("-z", "--exact",
+                        help="use exact zero-order-hold discretization \
+                                instead of Euler mini steps",
+                        action="store_true")
+
+    parser.add_argument("-p", "--processes", metavar="",
+                        help="number of worker processes, default: 1, \
+                                0 uses all cores",
+                        type=int, default=1)
+
+    parser.add_argument("-s", "--seed", metavar="",
+                        help="random seed of the initial states",
+                        type=int)
+
+    return parser.parse_args()
+
+
+def main():
+    args = argparser()
+
+    if args.model is not None:
+        policy = args.model
+        if not os.path.isfile(policy):
+            policy = os.path.join('data', 'components', 'rl', 'models',
+                                  args.model)
+    elif args.kregs is not None:
+        policy = args.kregs
+    else:
+        policy = (-1296.6, -3161.2, -31800, -9831)
+
+    print(f'Evaluating {policy} on {args.episodes} episodes ...')
+    start = time.perf_counter()
+    results = evaluation.evaluate(policy, args.episodes, args.episode_length,
+                                  processes=args.processes, seed=args.seed,
+                                  hold_steps=args.hold_steps,
+                                  variance=args.variance,
+                                  adv_reward=args.adv_reward,
+                                  ref=args.reference, exact=args.exact)
+    summary = evaluation.summarize(results)
+    print(f'Done in {time.perf_counter() - start:.2f} s')
+    print('--------------------------------')
+
+    units = {'settling time': 's', 'overshoot': 'm', 'rewards': ''}
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            stats = ', '.join(f'{stat}={number:.4g}'
+                              for stat, number in value.items())
+            print(f'\t{key} [{units[key]}]: {stats}')
+        elif isinstance(value, float):
+            print(f'\t{key}: {value:.2%}')
+        else:
+            print(f'\t{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ import gym
 
 from data.components.rl import environment as env_
 from data.components.rl.pg_util import *
+from data.components.rl.rollout import RolloutPool
 from data.components.rl import model_ripper as rip
 
 
@@ -61,6 +62,26 @@ def argparser():
                         help="use environment with reference system",
                         action="store_true")
 
+    parser.add_argument("-z", "--exact",
+                        help="use exact zero-order-hold discretization \
+                                instead of Euler mini steps",
+                        action="store_true")
+
+    parser.add_argument("-n", "--lockstep",
+                        help="play all episodes of an iteration in lockstep \
+                                on a vectorized environment",
+                        action="store_true")
+
+    parser.add_argument("-b", "--batched",
+                        help="record the episodes and compute the policy \
+                                gradient with one pass over the whole batch",
+                        action="store_true")
+
+    parser.add_argument("-p", "--processes", metavar="",
+                        help="play the episodes of an iteration on a pool \
+                                of worker processes, 0 uses all cores",
+                        type=int)
+
     parser.add_argument("-y", "--openai_gym",
                         help="uses CartPole Gym environment",
                         action="store_true")
@@ -97,11 +118,7 @@ def main():
     old_i = 0
     old_best = 0
 
-    if not args.openai_gym and args.continue_ is None:
-        model = get_ann(inputs=args.inputs, shape=args.shape)
-
     if args.continue_:
-        model = keras.models.load_model(args.continue_, compile=False)
         ripped_hypers = rip.model_ripper(args.continue_)
         hypers['episodes per iteration'] = ripped_hypers['eps']
         hypers['steps per episode'] = ripped_hypers['s']
@@ -128,9 +145,34 @@ def main():
 
     env = env_.Environment(adv_reward=hypers['advanced reward'],
                            ref=hypers['reference'],
-                           variance=hypers['variance'])
+                           variance=hypers['variance'],
+                           exact=args.exact,
+                           n_max_steps=hypers['steps per episode'])
     _ = env.reset()
 
+    if args.lockstep and not args.openai_gym:
+        vec_env = env_.VecEnvironment(hypers['episodes per iteration'],
+                                      adv_reward=hypers['advanced reward'],
+                                      ref=hypers['reference'],
+                                      variance=hypers['variance'],
+                                      exact=args.exact)
+
+    parallel = args.processes is not None and not args.openai_gym
+    if parallel:
+        # Workers are forked before the model starts TensorFlow's threads
+        pool = RolloutPool(args.processes or None,
+                           adv_reward=hypers['advanced reward'],
+                           ref=hypers['reference'],
+                           variance=hypers['variance'],
+                           exact=args.exact,
+                           n_max_steps=hypers['steps per episode'])
+
+    if not args.openai_gym and args.continue_ is None:
+        model = get_ann(inputs=args.inputs, shape=args.shape)
+
+    if args.continue_:
+        model = keras.models.load_model(args.continue_, compile=False)
+
     if args.openai_gym:
         model = get_ann()
         env = gym.make("CartPole-v1")
@@ -170,24 +212,55 @@ def main():
     i_best = 0
     best_weights = None
     for i in range(hypers['iterations']):
-        all_rewards, all_grads, best_ep_reward = play_multiple_episodes(
-            env, hypers['episodes per iteration'], hypers['steps per episode'],
-            model, loss_fn, gym=args.openai_gym
-        )
-        all_final_rewards = discount_and_normalize_rewards(all_rewards,
-                                                           hypers['discount'])
+        if parallel:
+            all_obs, all_actions, all_rewards, best_ep_reward = \
+                play_episodes_parallel(pool,
+                                       hypers['episodes per iteration'],
+                                       hypers['steps per episode'], model)
+        elif args.batched:
+            all_obs, all_actions, all_rewards, best_ep_reward = \
+                play_multiple_episodes_recorded(
+                    env, hypers['episodes per iteration'],
+                    hypers['steps per episode'], model, gym=args.openai_gym
+                )
+        elif args.lockstep and not args.openai_gym:
+            all_rewards, all_grads, best_ep_reward = play_episodes_lockstep(
+                vec_env, hypers['steps per episode'], model, loss_fn
+            )
+        else:
+            all_rewards, all_grads, best_ep_reward = play_multiple_episodes(
+                env, hypers['episodes per iteration'],
+                hypers['steps per episode'], model, loss_fn,
+                gym=args.openai_gym
+            )
+        if parallel or args.batched:
+            # Flat returns aligned with the concatenated observations
+            flat_rewards, offsets = flatten_episodes(all_rewards)
+            all_final_rewards = discount_and_normalize_flat(
+                flat_rewards, offsets, hypers['discount']
+            )
+        else:
+            all_final_rewards = discount_and_normalize_rewards(
+                all_rewards, hypers['discount']
+            )
 
         flat_all_rewards = [i for ep_rewards in all_rewards for i in ep_rewards]
         total_iter_reward = float(sum(flat_all_rewards))
         total_reward_progress.append(total_iter_reward)
 
-        all_mean_grads = []
-        for var_index in range(len(model.trainable_variables)):
-            mean_grads = tf.reduce_mean(
-                [final_reward * all_grads[ep_index][step][var_index]
-                 for ep_index, final_rewards in enumerate(all_final_rewards)
-                 for step, final_reward in enumerate(final_rewards)], axis=0)
-            all_mean_grads.append(mean_grads)
+        if parallel or args.batched:
+            all_mean_grads = policy_gradients(model, loss_fn, all_obs,
+                                              all_actions, all_final_rewards)
+        else:
+            all_mean_grads = []
+            for var_index in range(len(model.trainable_variables)):
+                mean_grads = tf.reduce_mean(
+                    [final_reward * all_grads[ep_index][step][var_index]
+                     for ep_index, final_rewards
+                     in enumerate(all_final_rewards)
+                     for step, final_reward in enumerate(final_rewards)],
+                    axis=0)
+                all_mean_grads.append(mean_grads)
         optimizer.apply_gradients(
             zip(all_mean_grads, model.trainable_variables)
         )
@@ -209,6 +282,9 @@ def main():
         if total_iter_reward > total_steps*threshold_factor:
             break
 
+    if parallel:
+        pool.close()
+
     jsondumb = total_reward_progress
 
     if hypers['variance'] == 0:
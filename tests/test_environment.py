@@ -0,0 +1,21 @@
+import numpy as np
+
+from data.components.rl.environment import Environment
+
+
+def test_observations_survive_buffer_wrap_and_reset():
+    np.random.seed(0)
+    env = Environment(n_max_steps=3)
+    kept = [env.reset()]
+    for step in range(5):
+        obs, _, _ = env.step(step % 2)
+        kept.append(obs)
+    copies = [obs.copy() for obs in kept]
+
+    # The buffer holds 3 steps, so it has wrapped around already
+    for step in range(5):
+        env.step(step % 2)
+    env.reset()
+
+    for obs, copy in zip(kept, copies):
+        np.testing.assert_array_equal(obs, copy)
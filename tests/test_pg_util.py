@@ -0,0 +1,55 @@
+import numpy as np
+
+from data.components.rl.pg_util import (discount_rewards,
+                                        discount_and_normalize_flat,
+                                        discount_and_normalize_rewards,
+                                        discount_flat,
+                                        flatten_episodes)
+
+
+def normalize_per_episode(all_rewards, discount_factor):
+    discounted = [discount_rewards(np.asarray(rewards, dtype=float),
+                                   discount_factor)
+                  for rewards in all_rewards]
+    flat = np.concatenate(discounted)
+    return [(rewards - flat.mean()) / flat.std() for rewards in discounted]
+
+
+def test_constant_returns_normalize_to_zero():
+    for all_rewards in ([[1.0], [1.0]], [[0.1]]*3):
+        flat_rewards, offsets = flatten_episodes(all_rewards)
+        normalized = discount_and_normalize_flat(flat_rewards, offsets, 0.9)
+        np.testing.assert_array_equal(normalized,
+                                      np.zeros(len(all_rewards)))
+
+
+def test_equal_length_constant_episodes_match_per_episode_discounting():
+    all_rewards = [[1.0]*5 for _ in range(4)]
+    flat_rewards, offsets = flatten_episodes(all_rewards)
+    normalized = discount_and_normalize_flat(flat_rewards, offsets, 0.9)
+
+    expected = np.concatenate(normalize_per_episode(all_rewards, 0.9))
+    np.testing.assert_allclose(normalized, expected, atol=1e-12)
+
+
+def test_episode_before_large_returns_keeps_its_own_returns():
+    flat_rewards, offsets = flatten_episodes([[0.0]*5, [1e6]*200])
+    discounted = discount_flat(flat_rewards, offsets, 0.99)
+    np.testing.assert_array_equal(discounted[:5], np.zeros(5))
+
+
+def test_large_returns_match_per_episode_discounting():
+    rng = np.random.RandomState(0)
+    all_rewards = [1e4 + rng.rand(length)
+                   for length in rng.randint(1, 300, size=25)]
+    flat_rewards, offsets = flatten_episodes(all_rewards)
+
+    discounted = discount_flat(flat_rewards, offsets, 0.99)
+    expected = np.concatenate([discount_rewards(rewards, 0.99)
+                               for rewards in all_rewards])
+    np.testing.assert_allclose(discounted, expected, rtol=1e-12)
+
+    normalized = discount_and_normalize_rewards(all_rewards, 0.99)
+    for episode, expected in zip(normalized,
+                                 normalize_per_episode(all_rewards, 0.99)):
+        np.testing.assert_allclose(episode, expected, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,68 @@
+import os
+import sys
+import argparse
+import subprocess
+
+
+# Demonstrator resources are loaded relative to the project root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import os, sys, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start, 'tensorflow' in sys.modules)
+"""
+
+
+def argparser():
+    parser = argparse.ArgumentParser(
+        description="############# Startup time #############"
+    )
+
+    parser.add_argument("-r", "--runs", metavar="",
+                        help="number of fresh interpreter runs, default: 5",
+                        type=int, default=5)
+
+    parser.add_argument("-t", "--tensorflow",
+                        help="also measure importing TensorFlow on its own",
+                        action="store_true")
+
+    return parser.parse_args()
+
+
+def measure(statement, runs):
+    """Returns the best import time in seconds of the statement in fresh
+    interpreters and whether TensorFlow was loaded by it."""
+
+    times = []
+    tf_loaded = False
+    for run in range(runs):
+        output = subprocess.run([sys.executable, '-c',
+                                 SNIPPET.format(statement)],
+                                cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.split()
+        times.append(float(output[-2]))
+        tf_loaded = output[-1] == 'True'
+    return min(times), tf_loaded
+
+
+def main():
+    args = argparser()
+
+    statements = {
+        'Demonstrator (data.main)': 'from data.main import main',
+        'RL Environment': 'from data.components.rl import environment'
+    }
+    if args.tensorflow:
+        statements['TensorFlow Keras'] = 'from tensorflow import keras'
+
+    for name, statement in statements.items():
+        seconds, tf_loaded = measure(statement, args.runs)
+        tf_str = 'TensorFlow loaded' if tf_loaded else 'without TensorFlow'
+        print(f'{name}: {seconds*1000:.0f} ms ({tf_str})')
+
+
+if __name__ == '__main__':
+    main()